@@ -1,6 +1,6 @@
 """Application configuration using Pydantic Settings."""
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -24,31 +24,40 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./data/db/opal.db"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle: int = 1800
+    db_pool_timeout: float = 30.0
+    db_query_cache_size: int = 1200
 
     # ChromaDB
     chroma_persist_dir: str = "./data/chroma"
 
+    # Ingestion
+    max_upload_size_mb: int = 100
+
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = True
+    sql_echo: bool = False
 
     # Frontend URL (for CORS)
     frontend_url: str = "http://localhost:3000"
 
-    @property
+    @cached_property
     def async_database_url(self) -> str:
         """Return async-compatible database URL."""
         if self.database_url.startswith("sqlite"):
             return self.database_url.replace("sqlite:", "sqlite+aiosqlite:")
         return self.database_url
 
-    @property
+    @cached_property
     def data_dir(self) -> Path:
         """Return the data directory path."""
         return Path("./data")
 
-    @property
+    @cached_property
     def pdfs_dir(self) -> Path:
         """Return the PDFs directory path."""
         return self.data_dir / "pdfs"
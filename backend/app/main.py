@@ -1,12 +1,19 @@
 """OPAL Orchestrator FastAPI Application."""
 
+import hashlib
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config import get_settings
-from app.models.database import init_db
+from app.models import Lab
+from app.models.database import async_session_maker, init_db, warm_pool
 from app.routers import (
     capabilities_router,
     chat_router,
@@ -14,6 +21,51 @@ from app.routers import (
     ingest_router,
     sources_router,
 )
+from app.services.cache import labs_cache
+
+
+# Columns returned by the /labs endpoint, in response key order
+LAB_COLUMNS = (
+    Lab.id,
+    Lab.name,
+    Lab.institution,
+    Lab.location,
+    Lab.description,
+    Lab.urls,
+    Lab.contacts,
+)
+LAB_KEYS = tuple(column.key for column in LAB_COLUMNS)
+
+
+# Slack for multipart boundaries and form fields on top of the file itself
+UPLOAD_OVERHEAD_BYTES = 1024 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized /ingest requests by Content-Length before the body is read.
+
+    Starlette spools multipart bodies to a temp file before the handler
+    runs, so the ingest handlers' own size checks only fire once the whole
+    upload has been received.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith("/ingest/"):
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_bytes:
+                        response = ORJSONResponse(
+                            {"detail": "Upload exceeds the configured size limit"},
+                            status_code=413,
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
 
 
 @asynccontextmanager
@@ -21,11 +73,16 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     await init_db()
+    await warm_pool()
+    settings.pdfs_dir.mkdir(parents=True, exist_ok=True)
     yield
     # Shutdown
     from app.services.embeddings import get_embedding_service
+    from app.services.ingestion import close_http_client, shutdown_pdf_executor
     embedding_service = get_embedding_service()
     await embedding_service.close()
+    await close_http_client()
+    shutdown_pdf_executor()
 
 
 settings = get_settings()
@@ -53,6 +110,17 @@ implement appropriate security measures.
     """,
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Compress larger JSON bodies (list endpoints); level 5 keeps most of the size
+# win of level 9 at a fraction of the CPU. Sets Vary: Accept-Encoding.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Added before CORS so rejected uploads still carry CORS headers
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=settings.max_upload_size_mb * 1024 * 1024 + UPLOAD_OVERHEAD_BYTES,
 )
 
 # Configure CORS
@@ -94,24 +162,22 @@ async def health():
 
 
 @app.get("/labs")
-async def list_labs():
-    """List all OPAL member labs (convenience endpoint)."""
-    from sqlalchemy import select
-    from app.models import Lab
-    from app.models.database import async_session_maker
-
-    async with async_session_maker() as session:
-        result = await session.execute(select(Lab))
-        labs = result.scalars().all()
-        return [
-            {
-                "id": lab.id,
-                "name": lab.name,
-                "institution": lab.institution,
-                "location": lab.location,
-                "description": lab.description,
-                "urls": lab.urls,
-                "contacts": lab.contacts,
-            }
-            for lab in labs
-        ]
+async def list_labs(request: Request):
+    """List all OPAL member labs (convenience endpoint).
+
+    The rendered payload is cached in-process and served with an ETag, so
+    conditional requests get a 304 without touching the database.
+    """
+    cached = labs_cache.get("list")
+    if cached is None:
+        version = labs_cache.version
+        async with async_session_maker() as session:
+            result = await session.execute(select(*LAB_COLUMNS))
+            body = orjson.dumps([dict(zip(LAB_KEYS, row)) for row in result.all()])
+        cached = (f'"{hashlib.sha1(body).hexdigest()}"', body)
+        labs_cache.set("list", cached, version)
+
+    etag, body = cached
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
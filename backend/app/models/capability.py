@@ -2,12 +2,11 @@
 
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
-import uuid
 
-from sqlalchemy import JSON, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.database import Base
+from app.models.database import Base, uuid7
 
 if TYPE_CHECKING:
     from app.models.facility import Facility
@@ -17,14 +16,17 @@ class Capability(Base):
     """Represents a specific capability offered by a facility."""
 
     __tablename__ = "capabilities"
+    __table_args__ = (
+        Index("ix_capabilities_facility_id_name", "facility_id", "name"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid7,
     )
     facility_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("facilities.id"), nullable=False, index=True
+        String(36), ForeignKey("facilities.id"), nullable=False
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
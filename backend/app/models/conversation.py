@@ -2,12 +2,19 @@
 
 from datetime import datetime
 from typing import Optional
-import uuid
 
-from sqlalchemy import JSON, DateTime, String, Text, func
+from sqlalchemy import JSON, DateTime, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.database import Base
+from app.models.database import Base, uuid7
+
+
+PREVIEW_LENGTH = 100
+
+
+def make_preview(content: str) -> str:
+    """Truncate message content to a conversation preview."""
+    return content[:PREVIEW_LENGTH] + "..." if len(content) > PREVIEW_LENGTH else content
 
 
 class Conversation(Base):
@@ -18,12 +25,18 @@ class Conversation(Base):
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid7,
     )
     title: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    preview: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+    # Kept in step with messages so listings never need to read the blob
+    message_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     messages: Mapped[list] = mapped_column(JSON, default=list, nullable=False)
     plan: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     sources: Mapped[list] = mapped_column(JSON, default=list, nullable=False)
+    # Chunk IDs of the stored sources, so new sources are deduplicated
+    # without reading the sources blob
+    source_chunk_ids: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), nullable=False
     )
@@ -35,9 +48,14 @@ class Conversation(Base):
         return f"<Conversation(id={self.id}, title={self.title})>"
 
     def get_preview(self) -> str:
-        """Get a preview of the conversation from the first user message."""
+        """Get a preview of the conversation from the first user message.
+
+        Uses the stored ``preview`` column when set; rows written before the
+        column existed fall back to scanning the messages.
+        """
+        if self.preview is not None:
+            return self.preview
         for msg in self.messages:
             if msg.get("role") == "user":
-                content = msg.get("content", "")
-                return content[:100] + "..." if len(content) > 100 else content
+                return make_preview(msg.get("content", ""))
         return "New conversation"
@@ -1,15 +1,51 @@
 """Database configuration and session management."""
 
+import asyncio
+import os
+import time
+import uuid
 from collections.abc import AsyncGenerator
 from pathlib import Path
 
-from sqlalchemy import event
+import orjson
+from sqlalchemy import (
+    JSON,
+    ColumnElement,
+    case,
+    cast,
+    event,
+    exists,
+    func,
+    inspect,
+    literal,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import get_settings
 
 
+def uuid7() -> str:
+    """Generate a time-ordered UUIDv7 string (RFC 9562).
+
+    The 48-bit millisecond timestamp prefix makes new primary keys land at
+    the right edge of the B-tree instead of scattering across it.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76  # version
+    value |= ((rand >> 62) & 0xFFF) << 64  # rand_a
+    value |= 0b10 << 62  # variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF  # rand_b
+    return str(uuid.UUID(int=value))
+
+
 class Base(DeclarativeBase):
     """Base class for all database models."""
     pass
@@ -21,12 +57,122 @@ settings = get_settings()
 db_path = Path(settings.database_url.replace("sqlite:///", ""))
 db_path.parent.mkdir(parents=True, exist_ok=True)
 
-# Create async engine
+# SQLite connection tuning: WAL lets readers proceed during writes and
+# synchronous=NORMAL halves the fsyncs per commit.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+is_sqlite = settings.async_database_url.startswith("sqlite")
+is_asyncpg = settings.async_database_url.startswith("postgresql+asyncpg")
+
+if is_sqlite:
+    connect_args = {"timeout": 30}
+elif is_asyncpg:
+    # Short OLTP queries gain nothing from JIT compilation, and a larger
+    # statement cache keeps the hot queries prepared per connection
+    connect_args = {"server_settings": {"jit": "off"}, "statement_cache_size": 1024}
+else:
+    connect_args = {}
+
+
+def json_dumps(value) -> str:
+    """Serialize a JSON column value with orjson."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Create async engine. Pooled connections are kept open so per-connection
+# setup is paid once. SQLite connections cannot be dropped server-side, so
+# they are neither pre-pinged nor recycled; server databases get both.
 engine = create_async_engine(
     settings.async_database_url,
-    echo=settings.debug,
+    echo=settings.sql_echo,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_pre_ping=not is_sqlite,
+    pool_recycle=-1 if is_sqlite else settings.db_pool_recycle,
+    query_cache_size=settings.db_query_cache_size,
+    connect_args=connect_args,
+    # JSON columns (messages, plan, sources, metadata) are encoded and
+    # decoded by orjson instead of the stdlib json module
+    json_serializer=json_dumps,
+    json_deserializer=orjson.loads,
 )
 
+if is_sqlite:
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _connection_record) -> None:
+        """Apply performance PRAGMAs to each new SQLite connection."""
+        cursor = dbapi_conn.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def json_array_append(column: ColumnElement, items: list) -> ColumnElement:
+    """Build an expression that appends items to a JSON array column.
+
+    Used in UPDATE statements so only the new items are sent to the
+    database instead of re-serializing the whole array.
+
+    Args:
+        column: JSON array column
+        items: JSON-serializable items to append
+
+    Returns:
+        SQL expression for the extended array
+    """
+    if not items:
+        return column
+    if is_sqlite:
+        # Each '$[#]' path inserts past the end of the array as extended so far
+        args = []
+        for item in items:
+            args.extend(("$[#]", func.json(json_dumps(item))))
+        return func.json_insert(column, *args, type_=JSON)
+    return cast(cast(column, JSONB).op("||")(literal(items, JSONB)), JSON)
+
+
+def json_array_matches(column: ColumnElement, values: list[str]) -> ColumnElement:
+    """Build a filter for JSON string arrays sharing an item with values.
+
+    Items are compared case-insensitively. Rows whose column is NULL, not an
+    array or an empty array also match, i.e. an unset list does not exclude
+    a row.
+
+    Args:
+        column: JSON array column
+        values: Strings to look for
+
+    Returns:
+        SQL boolean expression
+    """
+    # Non-arrays are swapped for an empty array, which has no items
+    if is_sqlite:
+        array = case((func.json_type(column) == "array", column), else_=literal("[]"))
+        items = func.json_each(array).table_valued("value")
+    else:
+        array = cast(column, JSONB)
+        array = case(
+            (func.jsonb_typeof(array) == "array", array),
+            else_=literal([], JSONB),
+        )
+        items = func.jsonb_array_elements_text(array).table_valued("value")
+
+    lowered = [value.lower() for value in values]
+    return or_(
+        ~exists(select(items.c.value)),
+        exists(select(items.c.value).where(func.lower(items.c.value).in_(lowered))),
+    )
+
+
 # Create async session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -48,7 +194,60 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def warm_pool() -> None:
+    """Open pool_size connections at startup so first requests skip connect."""
+
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_ping() for _ in range(settings.db_pool_size)))
+
+
+# Nullable columns added to tables after they were first created.
+# create_all() never alters an existing table, so init_db() adds these to
+# databases created before them.
+ADDED_COLUMNS = {
+    "conversations": ("preview", "message_count", "source_chunk_ids"),
+}
+
+
+def _add_missing_columns(sync_conn, inspector, tables: set[str]) -> None:
+    """Add ADDED_COLUMNS missing from the given existing tables.
+
+    Args:
+        sync_conn: Synchronous connection
+        inspector: Inspector bound to the connection
+        tables: Names of the tables that already existed
+    """
+    for table_name, column_names in ADDED_COLUMNS.items():
+        if table_name not in tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table_name)}
+        table = Base.metadata.tables[table_name]
+        for name in column_names:
+            if name in present:
+                continue
+            column_type = table.c[name].type.compile(dialect=sync_conn.dialect)
+            sync_conn.execute(
+                text(f"ALTER TABLE {table_name} ADD COLUMN {name} {column_type}")
+            )
+
+
+def _create_missing_tables(sync_conn) -> None:
+    """Run create_all only when some model table is missing.
+
+    Warm starts pay a single table-name lookup instead of per-table DDL,
+    plus a column lookup for each table listed in ADDED_COLUMNS.
+    """
+    inspector = inspect(sync_conn)
+    existing = set(inspector.get_table_names())
+    if not existing.issuperset(Base.metadata.tables):
+        Base.metadata.create_all(sync_conn)
+    _add_missing_columns(sync_conn, inspector, existing)
+
+
 async def init_db() -> None:
     """Initialize database tables."""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_tables)
@@ -2,12 +2,11 @@
 
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
-import uuid
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.database import Base
+from app.models.database import Base, uuid7
 
 if TYPE_CHECKING:
     from app.models.capability import Capability
@@ -19,14 +18,17 @@ class Facility(Base):
     """Represents a facility or platform within a lab."""
 
     __tablename__ = "facilities"
+    __table_args__ = (
+        Index("ix_facilities_lab_id_name", "lab_id", "name"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid7,
     )
     lab_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("labs.id"), nullable=False, index=True
+        String(36), ForeignKey("labs.id"), nullable=False
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -39,11 +41,18 @@ class Facility(Base):
 
     # Relationships
     lab: Mapped["Lab"] = relationship("Lab", back_populates="facilities")
+    # Collections must be loaded explicitly, e.g. selectinload(Facility.capabilities)
     capabilities: Mapped[list["Capability"]] = relationship(
-        "Capability", back_populates="facility", cascade="all, delete-orphan"
+        "Capability",
+        back_populates="facility",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
     )
     protocols: Mapped[list["Protocol"]] = relationship(
-        "Protocol", back_populates="facility", cascade="all, delete-orphan"
+        "Protocol",
+        back_populates="facility",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
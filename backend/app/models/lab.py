@@ -2,12 +2,11 @@
 
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
-import uuid
 
-from sqlalchemy import JSON, DateTime, String, func
+from sqlalchemy import JSON, DateTime, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.database import Base
+from app.models.database import Base, uuid7
 
 if TYPE_CHECKING:
     from app.models.facility import Facility
@@ -18,13 +17,16 @@ class Lab(Base):
     """Represents an OPAL member laboratory or institution."""
 
     __tablename__ = "labs"
+    __table_args__ = (
+        Index("ix_labs_name_institution", "name", "institution"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid7,
     )
-    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
     institution: Mapped[str] = mapped_column(String(255), nullable=False)
     location: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     contacts: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
@@ -38,11 +40,20 @@ class Lab(Base):
     )
 
     # Relationships
+    # Collections raise instead of lazy loading under AsyncSession; load them
+    # explicitly with selectinload(Lab.facilities).selectinload(Facility.capabilities)
+    # and selectinload(Lab.resources).
     facilities: Mapped[list["Facility"]] = relationship(
-        "Facility", back_populates="lab", cascade="all, delete-orphan"
+        "Facility",
+        back_populates="lab",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
     )
     resources: Mapped[list["Resource"]] = relationship(
-        "Resource", back_populates="lab", cascade="all, delete-orphan"
+        "Resource",
+        back_populates="lab",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -3,12 +3,12 @@
 from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Optional
-import uuid
 
-from sqlalchemy import JSON, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.database import Base
+from app.models.database import Base, uuid7
 
 if TYPE_CHECKING:
     from app.models.lab import Lab
@@ -29,16 +29,28 @@ class Resource(Base):
     """Represents a resource available at a lab."""
 
     __tablename__ = "resources"
+    __table_args__ = (
+        Index("ix_resources_lab_id_type", "lab_id", "type"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid7,
     )
     lab_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("labs.id"), nullable=False, index=True
+        String(36), ForeignKey("labs.id"), nullable=False
+    )
+    type: Mapped[ResourceType] = mapped_column(
+        SAEnum(
+            ResourceType,
+            native_enum=False,
+            length=50,
+            values_callable=lambda enum: [member.value for member in enum],
+        ),
+        nullable=False,
+        index=True,
     )
-    type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     access_constraints: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
@@ -1,31 +1,16 @@
 """Pydantic schemas for API request/response validation."""
 
-from datetime import datetime
-from enum import Enum
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
+from app.models.resource import ResourceType
+from app.models.source import SourceType
 
-# ============ Enums ============
-
-class SourceTypeEnum(str, Enum):
-    """Types of source documents."""
-    PDF = "pdf"
-    HTML = "html"
-    DOC = "doc"
-    YAML = "yaml"
-    MANUAL = "manual"
-
-
-class ResourceTypeEnum(str, Enum):
-    """Types of resources."""
-    STRAIN = "strain"
-    LIBRARY = "library"
-    INSTRUMENT = "instrument"
-    ASSAY = "assay"
-    DATASET = "dataset"
-    OTHER = "other"
+# Shared by schemas that are built from ORM rows. Validators are built on
+# first use rather than at import time.
+ORM_MODEL_CONFIG = ConfigDict(from_attributes=True, populate_by_name=True, defer_build=True)
 
 
 # ============ Lab Schemas ============
@@ -35,8 +20,8 @@ class LabBase(BaseModel):
     name: str
     institution: str
     location: Optional[str] = None
-    contacts: Optional[dict] = None
-    urls: Optional[dict] = None
+    contacts: Optional[dict[str, str]] = None
+    urls: Optional[dict[str, str]] = None
     description: Optional[str] = None
 
 
@@ -51,8 +36,7 @@ class LabResponse(LabBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 # ============ Facility Schemas ============
@@ -75,8 +59,7 @@ class FacilityResponse(FacilityBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 # ============ Capability Schemas ============
@@ -87,8 +70,8 @@ class CapabilityBase(BaseModel):
     description: Optional[str] = None
     modalities: Optional[list[str]] = None
     throughput: Optional[str] = None
-    sample_requirements: Optional[dict] = None
-    constraints: Optional[dict] = None
+    sample_requirements: Optional[dict[str, Any]] = None
+    constraints: Optional[dict[str, Any]] = None
     typical_outputs: Optional[list[str]] = None
     readiness_level: Optional[str] = None
     tags: Optional[list[str]] = None
@@ -108,8 +91,7 @@ class CapabilityResponse(CapabilityBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 class CapabilityWithContext(CapabilityResponse):
@@ -127,14 +109,14 @@ class ProtocolBase(BaseModel):
     summary: Optional[str] = None
     inputs: Optional[list[str]] = None
     outputs: Optional[list[str]] = None
-    constraints: Optional[dict] = None
+    constraints: Optional[dict[str, Any]] = None
 
 
 class ProtocolCreate(ProtocolBase):
     """Schema for creating a Protocol."""
     facility_id: str
     source_document_id: Optional[str] = None
-    excerpt_offsets: Optional[dict] = None
+    excerpt_offsets: Optional[dict[str, Any]] = None
 
 
 class ProtocolResponse(ProtocolBase):
@@ -142,23 +124,30 @@ class ProtocolResponse(ProtocolBase):
     id: str
     facility_id: str
     source_document_id: Optional[str] = None
-    excerpt_offsets: Optional[dict] = None
+    excerpt_offsets: Optional[dict[str, Any]] = None
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 # ============ Resource Schemas ============
 
 class ResourceBase(BaseModel):
     """Base schema for Resource."""
-    type: ResourceTypeEnum
+    model_config = ORM_MODEL_CONFIG
+
+    type: ResourceType
     name: str
     description: Optional[str] = None
-    access_constraints: Optional[dict] = None
-    metadata_: Optional[dict] = Field(None, alias="metadata")
+    access_constraints: Optional[dict[str, Any]] = None
+    # ORM rows expose the column as metadata_ (Base.metadata is SQLAlchemy's
+    # MetaData); API payloads use "metadata"
+    metadata_: Optional[dict[str, Any]] = Field(
+        None,
+        validation_alias=AliasChoices("metadata_", "metadata"),
+        serialization_alias="metadata",
+    )
 
 
 class ResourceCreate(ResourceBase):
@@ -175,19 +164,25 @@ class ResourceResponse(ResourceBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-        populate_by_name = True
+    model_config = ORM_MODEL_CONFIG
 
 
 # ============ Source Document Schemas ============
 
 class SourceDocumentBase(BaseModel):
     """Base schema for SourceDocument."""
-    type: SourceTypeEnum
+    model_config = ORM_MODEL_CONFIG
+
+    type: SourceType
     title: str
     url_or_path: str
-    metadata_: Optional[dict] = Field(None, alias="metadata")
+    # ORM rows expose the column as metadata_ (Base.metadata is SQLAlchemy's
+    # MetaData); API payloads use "metadata"
+    metadata_: Optional[dict[str, Any]] = Field(
+        None,
+        validation_alias=AliasChoices("metadata_", "metadata"),
+        serialization_alias="metadata",
+    )
 
 
 class SourceDocumentCreate(SourceDocumentBase):
@@ -200,17 +195,23 @@ class SourceDocumentResponse(SourceDocumentBase):
     id: str
     ingested_at: datetime
 
-    class Config:
-        from_attributes = True
-        populate_by_name = True
+    model_config = ORM_MODEL_CONFIG
 
 
 # ============ Source Chunk Schemas ============
 
 class SourceChunkBase(BaseModel):
     """Base schema for SourceChunk."""
+    model_config = ORM_MODEL_CONFIG
+
     text: str
-    metadata_: Optional[dict] = Field(None, alias="metadata")
+    # ORM rows expose the column as metadata_ (Base.metadata is SQLAlchemy's
+    # MetaData); API payloads use "metadata"
+    metadata_: Optional[dict[str, Any]] = Field(
+        None,
+        validation_alias=AliasChoices("metadata_", "metadata"),
+        serialization_alias="metadata",
+    )
     chunk_index: int = 0
 
 
@@ -225,9 +226,7 @@ class SourceChunkResponse(SourceChunkBase):
     source_document_id: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-        populate_by_name = True
+    model_config = ORM_MODEL_CONFIG
 
 
 # ============ Search Schemas ============
@@ -235,7 +234,7 @@ class SourceChunkResponse(SourceChunkBase):
 class SearchQuery(BaseModel):
     """Schema for capability search query."""
     query: str
-    filters: Optional[dict] = None
+    filters: Optional[dict[str, Any]] = None
     top_k: int = Field(default=10, ge=1, le=50)
 
 
@@ -246,7 +245,7 @@ class SearchResult(BaseModel):
     source_title: str
     text: str
     score: float
-    metadata: Optional[dict] = None
+    metadata: Optional[dict[str, Any]] = None
 
 
 class CapabilitySearchResult(BaseModel):
@@ -256,69 +255,72 @@ class CapabilitySearchResult(BaseModel):
     source_chunks: list[SearchResult]
 
 
-# ============ Chat Schemas ============
-
-class ChatMessage(BaseModel):
-    """Schema for a chat message."""
-    role: str  # "user" or "assistant"
-    content: str
-
-
-class ChatRequest(BaseModel):
-    """Schema for chat request."""
-    message: str
-    conversation_id: Optional[str] = None
-    context: Optional[dict] = None
-
-
-class ChatResponse(BaseModel):
-    """Schema for chat response."""
-    message: str
-    conversation_id: str
-    plan: Optional["OPALPlan"] = None
-    sources: list[SearchResult] = []
-
-
 # ============ Plan Schemas ============
 
 class Citation(BaseModel):
     """Citation for a capability recommendation."""
-    source_document_id: str
+    source_document_id: str = ""
     chunk_id: Optional[str] = None
-    quote: str
+    quote: str = ""
     source_title: Optional[str] = None
 
 
 class PlanStep(BaseModel):
     """A step in the OPAL resource deployment plan."""
-    step_id: str
-    objective: str
-    recommended_facility: str
-    capability_ids: list[str] = []
-    inputs: list[str] = []
-    outputs: list[str] = []
-    constraints: list[str] = []
-    dependencies: list[str] = []  # step_ids this step depends on
-    decision_points: list[str] = []
-    citations: list[Citation] = []
+    step_id: str = ""
+    objective: str = ""
+    recommended_facility: str = ""
+    capability_ids: list[str] = Field(default_factory=list)
+    inputs: list[str] = Field(default_factory=list)
+    outputs: list[str] = Field(default_factory=list)
+    constraints: list[str] = Field(default_factory=list)
+    dependencies: list[str] = Field(default_factory=list)  # step_ids this step depends on
+    decision_points: list[str] = Field(default_factory=list)
+    citations: list[Citation] = Field(default_factory=list)
     is_hypothesis: bool = False  # True if not backed by sources
 
 
 class RiskItem(BaseModel):
     """Risk or alternative for the plan."""
-    risk: str
-    impact: str
+    risk: str = ""
+    impact: str = ""
     alternative: Optional[str] = None
 
 
 class OPALPlan(BaseModel):
-    """Complete OPAL Resource Deployment Plan."""
-    goal_summary: str
-    assumptions: list[str] = []
-    steps: list[PlanStep] = []
-    open_questions: list[str] = []
-    risks_and_alternatives: list[RiskItem] = []
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    """Complete OPAL Resource Deployment Plan.
+
+    Every field has a default so partial plans from LLM tool calls validate.
+    """
+    goal_summary: str = ""
+    assumptions: list[str] = Field(default_factory=list)
+    steps: list[PlanStep] = Field(default_factory=list)
+    open_questions: list[str] = Field(default_factory=list)
+    risks_and_alternatives: list[RiskItem] = Field(default_factory=list)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+# ============ Chat Schemas ============
+
+class ChatMessage(BaseModel):
+    """Schema for a chat message."""
+    role: str  # "user" or "assistant"
+    content: str
+
+
+class ChatRequest(BaseModel):
+    """Schema for chat request."""
+    message: str
+    conversation_id: Optional[str] = None
+    context: Optional[dict[str, Any]] = None
+
+
+class ChatResponse(BaseModel):
+    """Schema for chat response."""
+    message: str
+    conversation_id: str
+    plan: Optional[OPALPlan] = None
+    sources: list[SearchResult] = Field(default_factory=list)
 
 
 # ============ Ingestion Schemas ============
@@ -343,5 +345,10 @@ class IngestResponse(BaseModel):
     message: str
 
 
-# Update forward references
-ChatResponse.model_rebuild()
+class IngestJobStatus(BaseModel):
+    """Schema for the status of a background ingestion job."""
+    job_id: str
+    status: str  # "queued", "running", "completed" or "failed"
+    source_document_id: Optional[str] = None
+    chunks_created: Optional[int] = None
+    error: Optional[str] = None
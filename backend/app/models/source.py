@@ -3,12 +3,12 @@
 from datetime import datetime
 from enum import Enum
 from typing import Optional
-import uuid
 
-from sqlalchemy import JSON, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.database import Base
+from app.models.database import Base, uuid7
 
 
 class SourceType(str, Enum):
@@ -29,9 +29,18 @@ class SourceDocument(Base):
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid7,
+    )
+    type: Mapped[SourceType] = mapped_column(
+        SAEnum(
+            SourceType,
+            native_enum=False,
+            length=20,
+            values_callable=lambda enum: [member.value for member in enum],
+        ),
+        nullable=False,
+        index=True,
     )
-    type: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
     title: Mapped[str] = mapped_column(String(500), nullable=False, index=True)
     url_or_path: Mapped[str] = mapped_column(String(2000), nullable=False)
     ingested_at: Mapped[datetime] = mapped_column(
@@ -52,14 +61,21 @@ class SourceChunk(Base):
     """Represents a chunk of text from a source document for embedding."""
 
     __tablename__ = "source_chunks"
+    __table_args__ = (
+        Index(
+            "ix_source_chunks_source_document_id_chunk_index",
+            "source_document_id",
+            "chunk_index",
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid7,
     )
     source_document_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("source_documents.id"), nullable=False, index=True
+        String(36), ForeignKey("source_documents.id"), nullable=False
     )
     text: Mapped[str] = mapped_column(Text, nullable=False)
     metadata_: Mapped[Optional[dict]] = mapped_column("metadata", JSON, nullable=True)
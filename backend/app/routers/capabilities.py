@@ -1,12 +1,15 @@
 """Capabilities API router."""
 
+from collections.abc import AsyncIterator
+
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 
 from app.models import Capability, Facility, Lab
-from app.models.database import get_db
+from app.models.database import async_session_maker, get_db
 from app.models.schemas import (
     CapabilityResponse,
     CapabilitySearchResult,
@@ -18,6 +21,16 @@ from app.services.retrieval import get_retrieval_service
 
 router = APIRouter(prefix="/capabilities", tags=["capabilities"])
 
+# Rows fetched per round trip when streaming the capability list
+CAPABILITY_STREAM_BATCH_SIZE = 100
+
+# Base listing statement, built once; filters and paging are applied per call
+LIST_CAPABILITIES_QUERY = (
+    select(Capability, Facility.name, Lab.name, Lab.institution)
+    .join(Facility, Capability.facility_id == Facility.id)
+    .join(Lab, Facility.lab_id == Lab.id)
+)
+
 
 @router.get("/search", response_model=list[CapabilitySearchResult])
 async def search_capabilities(
@@ -67,63 +80,84 @@ async def search_capabilities(
     return results
 
 
+async def _stream_capabilities(query: Select) -> AsyncIterator[bytes]:
+    """Encode capability rows as a JSON array, one batch at a time.
+
+    Rows are fetched from a server-side cursor in batches of
+    CAPABILITY_STREAM_BATCH_SIZE and each batch is sent as one chunk. The
+    request-scoped session is closed before a streamed body is sent, so
+    the stream opens its own session.
+
+    Args:
+        query: Select of (Capability, facility name, lab name, institution)
+
+    Yields:
+        Chunks of the JSON array
+    """
+    async with async_session_maker() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=CAPABILITY_STREAM_BATCH_SIZE)
+        )
+        separator = b"["
+        async for rows in result.partitions():
+            chunk = bytearray()
+            for cap, facility_name, lab_name, lab_institution in rows:
+                # Rows come straight from the database, so validation is intentionally skipped
+                capability = CapabilityWithContext.model_construct(
+                    id=cap.id,
+                    facility_id=cap.facility_id,
+                    name=cap.name,
+                    description=cap.description,
+                    modalities=cap.modalities,
+                    throughput=cap.throughput,
+                    sample_requirements=cap.sample_requirements,
+                    constraints=cap.constraints,
+                    typical_outputs=cap.typical_outputs,
+                    readiness_level=cap.readiness_level,
+                    tags=cap.tags,
+                    source_document_id=cap.source_document_id,
+                    created_at=cap.created_at,
+                    updated_at=cap.updated_at,
+                    facility_name=facility_name,
+                    lab_name=lab_name,
+                    lab_institution=lab_institution,
+                )
+                chunk += separator
+                chunk += capability.model_dump_json().encode()
+                separator = b","
+            yield bytes(chunk)
+        yield b"[]" if separator == b"[" else b"]"
+
+
 @router.get("", response_model=list[CapabilityWithContext])
 async def list_capabilities(
     lab_id: str | None = Query(None, description="Filter by lab ID"),
     facility_id: str | None = Query(None, description="Filter by facility ID"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
-    db: AsyncSession = Depends(get_db),
-) -> list[CapabilityWithContext]:
+) -> StreamingResponse:
     """List all capabilities with optional filters.
 
+    The JSON array is streamed as rows are read, so large pages are never
+    held in memory in full.
+
     Args:
         lab_id: Optional lab ID filter
         facility_id: Optional facility ID filter
         skip: Number of results to skip
         limit: Maximum number of results
-        db: Database session
 
     Returns:
         List of capabilities with context
     """
-    query = (
-        select(Capability)
-        .options(selectinload(Capability.facility).selectinload(Facility.lab))
-        .offset(skip)
-        .limit(limit)
-    )
+    query = LIST_CAPABILITIES_QUERY.offset(skip).limit(limit)
 
     if facility_id:
         query = query.where(Capability.facility_id == facility_id)
     elif lab_id:
-        query = query.join(Facility).where(Facility.lab_id == lab_id)
-
-    result = await db.execute(query)
-    capabilities = result.scalars().all()
+        query = query.where(Facility.lab_id == lab_id)
 
-    return [
-        CapabilityWithContext(
-            id=cap.id,
-            facility_id=cap.facility_id,
-            name=cap.name,
-            description=cap.description,
-            modalities=cap.modalities,
-            throughput=cap.throughput,
-            sample_requirements=cap.sample_requirements,
-            constraints=cap.constraints,
-            typical_outputs=cap.typical_outputs,
-            readiness_level=cap.readiness_level,
-            tags=cap.tags,
-            source_document_id=cap.source_document_id,
-            created_at=cap.created_at,
-            updated_at=cap.updated_at,
-            facility_name=cap.facility.name,
-            lab_name=cap.facility.lab.name,
-            lab_institution=cap.facility.lab.institution,
-        )
-        for cap in capabilities
-    ]
+    return StreamingResponse(_stream_capabilities(query), media_type="application/json")
 
 
 @router.get("/{capability_id}", response_model=CapabilityWithContext)
@@ -142,7 +176,7 @@ async def get_capability(
     """
     result = await db.execute(
         select(Capability)
-        .options(selectinload(Capability.facility).selectinload(Facility.lab))
+        .options(joinedload(Capability.facility).joinedload(Facility.lab))
         .where(Capability.id == capability_id)
     )
     capability = result.scalar_one_or_none()
@@ -150,7 +184,8 @@ async def get_capability(
     if not capability:
         raise HTTPException(status_code=404, detail="Capability not found")
 
-    return CapabilityWithContext(
+    # Trusted database row: skip validation
+    return CapabilityWithContext.model_construct(
         id=capability.id,
         facility_id=capability.facility_id,
         name=capability.name,
@@ -182,4 +217,18 @@ async def list_labs(
     """
     result = await db.execute(select(Lab))
     labs = result.scalars().all()
-    return [LabResponse.model_validate(lab) for lab in labs]
+    # Trusted database rows: skip validation
+    return [
+        LabResponse.model_construct(
+            id=lab.id,
+            name=lab.name,
+            institution=lab.institution,
+            location=lab.location,
+            contacts=lab.contacts,
+            urls=lab.urls,
+            description=lab.description,
+            created_at=lab.created_at,
+            updated_at=lab.updated_at,
+        )
+        for lab in labs
+    ]
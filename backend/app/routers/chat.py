@@ -1,20 +1,33 @@
 """Chat API router."""
 
-from fastapi import APIRouter, Depends
+import logging
+from collections.abc import AsyncIterator
+
+import orjson
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.database import get_db
-from app.models.schemas import ChatRequest, ChatResponse
+from app.models.database import async_session_maker, get_db
+from app.models.schemas import ChatRequest, ChatResponse, OPALPlan, PlanStep
 from app.services.chat import get_chat_service
+from app.services.planner import get_planner_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+CHAT_RESPONSE_ADAPTER = TypeAdapter(ChatResponse)
+PLAN_STEP_ADAPTER = TypeAdapter(PlanStep)
+PLAN_ADAPTER = TypeAdapter(OPALPlan)
+
 
 @router.post("", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
     db: AsyncSession = Depends(get_db),
-) -> ChatResponse:
+) -> Response:
     """Process a chat message and return a response.
 
     The chat endpoint handles the conversational interface with the OPAL
@@ -33,7 +46,65 @@ async def chat(
         message=request.message,
         conversation_id=request.conversation_id,
     )
-    return response
+    # The service already built a validated ChatResponse; dump it to bytes
+    # directly instead of letting FastAPI re-validate it as a dict
+    return Response(
+        content=CHAT_RESPONSE_ADAPTER.dump_json(response),
+        media_type="application/json",
+    )
+
+
+def _sse_event(event: str, data: bytes) -> bytes:
+    """Encode one server-sent event."""
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+async def _stream_chat(request: ChatRequest) -> AsyncIterator[bytes]:
+    """Run a chat turn and encode its output as server-sent events.
+
+    The request-scoped session is closed before a streamed body is sent,
+    so the stream opens its own session.
+
+    Args:
+        request: Chat request with message and optional conversation_id
+
+    Yields:
+        Encoded "token", "done" and "error" events
+    """
+    async with async_session_maker() as session:
+        chat_service = get_chat_service(session)
+        try:
+            async for item in chat_service.chat_stream(
+                message=request.message,
+                conversation_id=request.conversation_id,
+            ):
+                if isinstance(item, str):
+                    yield _sse_event("token", orjson.dumps({"text": item}))
+                else:
+                    yield _sse_event("done", CHAT_RESPONSE_ADAPTER.dump_json(item))
+        except Exception as e:
+            # Headers are already sent, so failures are reported in-band
+            logger.exception("Streaming chat failed")
+            await session.rollback()
+            yield _sse_event("error", orjson.dumps({"detail": str(e)}))
+
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """Process a chat message, streaming the reply as server-sent events.
+
+    Each text delta is sent as a "token" event as soon as the LLM produces
+    it, including text written before tool calls. A final "done" event
+    carries the same ChatResponse POST /chat returns; an "error" event is
+    sent instead if the turn fails.
+
+    Args:
+        request: Chat request with message and optional conversation_id
+
+    Returns:
+        text/event-stream response
+    """
+    return StreamingResponse(_stream_chat(request), media_type="text/event-stream")
 
 
 @router.post("/plan")
@@ -57,8 +128,6 @@ async def generate_plan(
     Returns:
         Generated OPAL plan
     """
-    from app.services.planner import get_planner_service
-
     planner_service = get_planner_service(db)
     plan = await planner_service.generate_plan(
         goal=goal,
@@ -66,3 +135,61 @@ async def generate_plan(
         constraints=constraints,
     )
     return plan
+
+
+async def _stream_plan(
+    goal: str,
+    context: dict | None,
+    constraints: list[str] | None,
+) -> AsyncIterator[bytes]:
+    """Generate a plan and encode its steps as server-sent events.
+
+    Args:
+        goal: Research goal description
+        context: Optional context (organism, plant system, etc.)
+        constraints: Optional list of constraints
+
+    Yields:
+        Encoded "step", "done" and "error" events
+    """
+    async with async_session_maker() as session:
+        planner_service = get_planner_service(session)
+        try:
+            async for item in planner_service.stream_plan(
+                goal=goal,
+                context=context,
+                constraints=constraints,
+            ):
+                if isinstance(item, PlanStep):
+                    yield _sse_event("step", PLAN_STEP_ADAPTER.dump_json(item))
+                else:
+                    yield _sse_event("done", PLAN_ADAPTER.dump_json(item))
+        except Exception as e:
+            logger.exception("Streaming plan generation failed")
+            yield _sse_event("error", orjson.dumps({"detail": str(e)}))
+
+
+@router.post("/plan/stream")
+async def generate_plan_stream(
+    goal: str,
+    context: dict | None = None,
+    constraints: list[str] | None = None,
+) -> StreamingResponse:
+    """Generate a research plan, streaming its steps as server-sent events.
+
+    Each step is sent as a "step" event as soon as the LLM has written it.
+    A final "done" event carries the same plan POST /chat/plan returns; an
+    "error" event is sent instead if generation fails.
+
+    Args:
+        goal: Research goal description
+        context: Optional context (organism, plant system, etc.)
+        constraints: Optional list of constraints
+
+    Returns:
+        text/event-stream response
+    """
+    return StreamingResponse(
+        _stream_plan(goal, context, constraints),
+        media_type="text/event-stream",
+    )
@@ -3,13 +3,18 @@
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from sqlalchemy import select, desc
+from sqlalchemy import delete, desc, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Conversation
+from app.models.conversation import make_preview
 from app.models.database import get_db
+from app.models.schemas import ORM_MODEL_CONFIG
+from app.services.cache import conversations_cache
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
 
@@ -23,8 +28,7 @@ class ConversationSummary(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 class ConversationDetail(BaseModel):
@@ -37,8 +41,7 @@ class ConversationDetail(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 class ConversationUpdate(BaseModel):
@@ -46,12 +49,66 @@ class ConversationUpdate(BaseModel):
     title: Optional[str] = None
 
 
+# Count and preview are computed in SQL so the messages blob is never loaded
+# for a listing. The statement is built once; offset/limit are bound
+# parameters, so every page hits the same compiled-SQL cache entry.
+LIST_CONVERSATIONS_QUERY = (
+    select(
+        Conversation.id,
+        Conversation.title,
+        Conversation.preview,
+        Conversation.messages[0]["content"].as_string().label("first_message"),
+        # Rows written before message_count existed count the JSON array
+        func.coalesce(
+            Conversation.message_count, func.json_array_length(Conversation.messages)
+        ).label("message_count"),
+        Conversation.created_at,
+        Conversation.updated_at,
+    )
+    .order_by(desc(Conversation.updated_at))
+)
+
+
+def _row_preview(preview: Optional[str], first_message: Optional[str]) -> str:
+    """Resolve a listing preview from the stored column or the first message."""
+    if preview is not None:
+        return preview
+    if first_message is not None:
+        return make_preview(first_message)
+    return "New conversation"
+
+
+def _detail_response(conversation: Conversation) -> Response:
+    """Serialize a stored conversation without re-validating it.
+
+    The messages, plan and sources columns were validated when they were
+    written, so the detail is constructed directly and dumped to JSON,
+    skipping both model validation and FastAPI's response_model pass.
+
+    Args:
+        conversation: Conversation row
+
+    Returns:
+        JSON response with the conversation details
+    """
+    detail = ConversationDetail.model_construct(
+        id=conversation.id,
+        title=conversation.title,
+        messages=conversation.messages,
+        plan=conversation.plan,
+        sources=conversation.sources or [],
+        created_at=conversation.created_at,
+        updated_at=conversation.updated_at,
+    )
+    return Response(content=detail.model_dump_json(), media_type="application/json")
+
+
 @router.get("", response_model=list[ConversationSummary])
 async def list_conversations(
     skip: int = 0,
     limit: int = 50,
     db: AsyncSession = Depends(get_db),
-) -> list[ConversationSummary]:
+) -> Response:
     """List all conversations, newest first.
 
     Args:
@@ -62,32 +119,38 @@ async def list_conversations(
     Returns:
         List of conversation summaries
     """
-    result = await db.execute(
-        select(Conversation)
-        .order_by(desc(Conversation.updated_at))
-        .offset(skip)
-        .limit(limit)
-    )
-    conversations = result.scalars().all()
-
-    return [
-        ConversationSummary(
-            id=conv.id,
-            title=conv.title,
-            preview=conv.get_preview(),
-            message_count=len(conv.messages),
-            created_at=conv.created_at,
-            updated_at=conv.updated_at,
-        )
-        for conv in conversations
-    ]
+    cache_key = ("list", skip, limit)
+    body = conversations_cache.get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
+    version = conversations_cache.version
+    result = await db.execute(LIST_CONVERSATIONS_QUERY.offset(skip).limit(limit))
+
+    # Rows are encoded straight to JSON in ConversationSummary key order;
+    # no per-row model objects are built
+    body = orjson.dumps([
+        {
+            "id": row.id,
+            "title": row.title,
+            # Rows written before the preview column existed fall back to
+            # the first message, which is always the user's
+            "preview": _row_preview(row.preview, row.first_message),
+            "message_count": row.message_count,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+        }
+        for row in result
+    ])
+    conversations_cache.set(cache_key, body, version)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{conversation_id}", response_model=ConversationDetail)
 async def get_conversation(
     conversation_id: str,
     db: AsyncSession = Depends(get_db),
-) -> ConversationDetail:
+) -> Response:
     """Get a specific conversation with all messages.
 
     Args:
@@ -105,63 +168,52 @@ async def get_conversation(
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    return ConversationDetail(
-        id=conversation.id,
-        title=conversation.title,
-        messages=conversation.messages,
-        plan=conversation.plan,
-        sources=conversation.sources or [],
-        created_at=conversation.created_at,
-        updated_at=conversation.updated_at,
-    )
+    return _detail_response(conversation)
 
 
 @router.patch("/{conversation_id}", response_model=ConversationDetail)
 async def update_conversation(
     conversation_id: str,
-    update: ConversationUpdate,
+    conversation_update: ConversationUpdate,
     db: AsyncSession = Depends(get_db),
-) -> ConversationDetail:
+) -> Response:
     """Update a conversation (e.g., rename title).
 
     Args:
         conversation_id: ID of the conversation
-        update: Fields to update
+        conversation_update: Fields to update
         db: Database session
 
     Returns:
         Updated conversation
     """
+    if conversation_update.title is None:
+        return await get_conversation(conversation_id, db)
+
+    # UPDATE ... RETURNING: one round trip instead of select, commit, refresh
     result = await db.execute(
-        select(Conversation).where(Conversation.id == conversation_id)
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .values(title=conversation_update.title)
+        .returning(Conversation)
     )
     conversation = result.scalar_one_or_none()
 
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    if update.title is not None:
-        conversation.title = update.title
-
     await db.commit()
-    await db.refresh(conversation)
+    # Bulk UPDATE bypasses the mapper events that invalidate the cache
+    conversations_cache.invalidate()
 
-    return ConversationDetail(
-        id=conversation.id,
-        title=conversation.title,
-        messages=conversation.messages,
-        plan=conversation.plan,
-        sources=conversation.sources or [],
-        created_at=conversation.created_at,
-        updated_at=conversation.updated_at,
-    )
+    return _detail_response(conversation)
 
 
 @router.delete("/{conversation_id}")
 async def delete_conversation(
     conversation_id: str,
     db: AsyncSession = Depends(get_db),
-) -> dict:
+) -> ORJSONResponse:
     """Delete a conversation.
 
     Args:
@@ -172,14 +224,15 @@ async def delete_conversation(
         Confirmation message
     """
     result = await db.execute(
-        select(Conversation).where(Conversation.id == conversation_id)
+        delete(Conversation)
+        .where(Conversation.id == conversation_id)
+        .returning(Conversation.id)
     )
-    conversation = result.scalar_one_or_none()
 
-    if not conversation:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    await db.delete(conversation)
     await db.commit()
+    conversations_cache.invalidate()
 
-    return {"message": "Conversation deleted", "id": conversation_id}
+    return ORJSONResponse({"message": "Conversation deleted", "id": conversation_id})
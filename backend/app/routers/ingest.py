@@ -1,26 +1,218 @@
 """Ingestion API router."""
 
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, BinaryIO, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+)
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.models.database import get_db
-from app.models.schemas import IngestResponse, IngestURLRequest
-from app.services.ingestion import get_ingestion_service
+from app.models import SourceDocument
+from app.models.database import async_session_maker, get_db, uuid7
+from app.models.schemas import IngestJobStatus, IngestResponse, IngestURLRequest
+from app.services.ingestion import IngestionService, get_ingestion_service
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
 
 router = APIRouter(prefix="/ingest", tags=["ingestion"])
 
+# Background ingestion jobs by id, oldest first. Status is kept in process
+# memory, so it is only visible to the worker that accepted the upload.
+_ingest_jobs: OrderedDict[str, IngestJobStatus] = OrderedDict()
+
+# Most jobs kept; beyond it the oldest finished jobs are forgotten
+MAX_INGEST_JOBS = 1000
+
+IngestCall = Callable[[IngestionService], Awaitable[tuple[SourceDocument, int]]]
+
+# Uploads are copied to disk in 1 MiB chunks through a single reused buffer
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+def _copy_upload(source: BinaryIO, file_path: Path, max_bytes: int) -> Optional[str]:
+    """Copy an upload to disk chunk by chunk, hashing it on the way.
+
+    Args:
+        source: Spooled upload file
+        file_path: Destination path
+        max_bytes: Maximum accepted upload size
+
+    Returns:
+        SHA-256 hex digest of the content, or None if the upload exceeded
+        max_bytes (the partial file is removed)
+    """
+    buffer = bytearray(UPLOAD_CHUNK_SIZE)
+    view = memoryview(buffer)
+    digest = hashlib.sha256()
+    written = 0
+    with open(file_path, "wb") as f:
+        while size := source.readinto(buffer):
+            written += size
+            if written > max_bytes:
+                break
+            digest.update(view[:size])
+            f.write(view[:size])
+    if written > max_bytes:
+        file_path.unlink()
+        return None
+    return digest.hexdigest()
+
+
+async def _run_ingest_job(job: IngestJobStatus, ingest: IngestCall) -> None:
+    """Run an ingestion after the response is sent and record its outcome.
+
+    The request's session is closed by then, so the job opens its own.
+
+    Args:
+        job: Job status entry to update
+        ingest: Calls the ingestion service method for this job
+    """
+    job.status = "running"
+    try:
+        async with async_session_maker() as session:
+            source_doc, num_chunks = await ingest(get_ingestion_service(session))
+    except Exception as e:
+        logger.exception("Background ingestion %s failed", job.job_id)
+        job.status = "failed"
+        job.error = str(e)
+        return
+    job.status = "completed"
+    job.source_document_id = source_doc.id
+    job.chunks_created = num_chunks
+
+
+def _prune_ingest_jobs() -> None:
+    """Forget the oldest finished jobs while more than MAX_INGEST_JOBS are kept.
+
+    Queued and running jobs are never dropped, so their status stays
+    available until they finish.
+    """
+    excess = len(_ingest_jobs) - MAX_INGEST_JOBS
+    if excess <= 0:
+        return
+    finished = [
+        job_id
+        for job_id, job in _ingest_jobs.items()
+        if job.status in ("completed", "failed")
+    ]
+    for job_id in finished[:excess]:
+        del _ingest_jobs[job_id]
+
+
+def _queue_ingest_job(
+    background_tasks: BackgroundTasks, ingest: IngestCall
+) -> ORJSONResponse:
+    """Queue an ingestion to run in the background.
+
+    Args:
+        background_tasks: Request background tasks
+        ingest: Calls the ingestion service method for this job
+
+    Returns:
+        202 response with the queued job status
+    """
+    job = IngestJobStatus(job_id=uuid7(), status="queued")
+    _ingest_jobs[job.job_id] = job
+    _prune_ingest_jobs()
+    background_tasks.add_task(_run_ingest_job, job, ingest)
+    return ORJSONResponse(status_code=202, content=job.model_dump())
+
+
+def _upload_path(directory: Path, filename: Optional[str]) -> Path:
+    """Resolve an upload's destination, keeping only the client's base name.
+
+    Args:
+        directory: Directory the upload belongs in
+        filename: Client-supplied file name
+
+    Returns:
+        Path inside directory
 
-@router.post("/pdf", response_model=IngestResponse)
+    Raises:
+        HTTPException: 400 if no usable file name remains
+    """
+    name = Path(filename or "").name
+    if name in ("", ".", ".."):
+        raise HTTPException(status_code=400, detail="Invalid upload file name")
+    return directory / name
+
+
+def _upload_too_large() -> HTTPException:
+    """Build the error for an upload over the configured size limit."""
+    return HTTPException(
+        status_code=413,
+        detail=f"Upload exceeds the {settings.max_upload_size_mb} MB limit",
+    )
+
+
+def _check_upload_size(file: UploadFile) -> int:
+    """Reject an upload whose size, as parsed from the request, is too large.
+
+    Args:
+        file: Uploaded file
+
+    Returns:
+        The upload size limit in bytes
+
+    Raises:
+        HTTPException: 413 if the upload exceeds the configured size limit
+    """
+    max_bytes = settings.max_upload_size_mb * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
+        raise _upload_too_large()
+    return max_bytes
+
+
+async def _save_upload(file: UploadFile, file_path: Path) -> str:
+    """Stream an uploaded file to disk without reading it into memory.
+
+    Args:
+        file: Uploaded file
+        file_path: Destination path
+
+    Returns:
+        SHA-256 hex digest of the saved content
+
+    Raises:
+        HTTPException: 413 if the upload exceeds the configured size limit
+    """
+    max_bytes = _check_upload_size(file)
+    content_hash = await asyncio.to_thread(_copy_upload, file.file, file_path, max_bytes)
+    if content_hash is None:
+        raise _upload_too_large()
+    return content_hash
+
+
+@router.post(
+    "/pdf",
+    response_model=IngestResponse,
+    responses={202: {"model": IngestJobStatus}},
+)
 async def ingest_pdf(
     file: Annotated[UploadFile, File(description="PDF file to ingest")],
     title: Annotated[str, Form(description="Document title")],
+    background_tasks: BackgroundTasks,
     description: Annotated[str | None, Form(description="Optional description")] = None,
+    background: bool = Query(False, description="Ingest in the background and return 202"),
     db: AsyncSession = Depends(get_db),
-) -> IngestResponse:
+) -> IngestResponse | ORJSONResponse:
     """Ingest a PDF document into the knowledge base.
 
     The PDF is processed, chunked, and embedded for semantic search.
@@ -29,22 +221,31 @@ async def ingest_pdf(
     Args:
         file: PDF file upload
         title: Document title
+        background_tasks: Request background tasks
         description: Optional description
+        background: Return 202 with a job ID instead of waiting for ingestion
         db: Database session
 
     Returns:
-        IngestResponse with document ID and chunk count
+        IngestResponse with document ID and chunk count, or the queued job
+        status when background is set
     """
-    settings = get_settings()
+    # Save uploaded file (pdfs_dir is created at startup)
+    file_path = _upload_path(settings.pdfs_dir, file.filename)
 
-    # Save uploaded file
-    pdf_dir = settings.pdfs_dir
-    pdf_dir.mkdir(parents=True, exist_ok=True)
-    file_path = pdf_dir / file.filename
+    content_hash = await _save_upload(file, file_path)
 
-    content = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
+    metadata = {"description": description} if description else None
+    if background:
+        return _queue_ingest_job(
+            background_tasks,
+            lambda service: service.ingest_pdf(
+                file_path=file_path,
+                title=title,
+                metadata=metadata,
+                content_hash=content_hash,
+            ),
+        )
 
     # Ingest the PDF
     try:
@@ -52,7 +253,8 @@ async def ingest_pdf(
         source_doc, num_chunks = await ingestion_service.ingest_pdf(
             file_path=file_path,
             title=title,
-            metadata={"description": description} if description else None,
+            metadata=metadata,
+            content_hash=content_hash,
         )
 
         return IngestResponse(
@@ -64,11 +266,17 @@ async def ingest_pdf(
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
 
 
-@router.post("/url", response_model=IngestResponse)
+@router.post(
+    "/url",
+    response_model=IngestResponse,
+    responses={202: {"model": IngestJobStatus}},
+)
 async def ingest_url(
     request: IngestURLRequest,
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False, description="Ingest in the background and return 202"),
     db: AsyncSession = Depends(get_db),
-) -> IngestResponse:
+) -> IngestResponse | ORJSONResponse:
     """Ingest a web page into the knowledge base.
 
     The URL is scraped, text is extracted, chunked, and embedded
@@ -76,17 +284,29 @@ async def ingest_url(
 
     Args:
         request: URL ingestion request with url and title
+        background_tasks: Request background tasks
+        background: Return 202 with a job ID instead of waiting for ingestion
         db: Database session
 
     Returns:
-        IngestResponse with document ID and chunk count
+        IngestResponse with document ID and chunk count, or the queued job
+        status when background is set
     """
+    metadata = {"description": request.description} if request.description else None
+    if background:
+        return _queue_ingest_job(
+            background_tasks,
+            lambda service: service.ingest_url(
+                url=request.url, title=request.title, metadata=metadata
+            ),
+        )
+
     try:
         ingestion_service = get_ingestion_service(db)
         source_doc, num_chunks = await ingestion_service.ingest_url(
             url=request.url,
             title=request.title,
-            metadata={"description": request.description} if request.description else None,
+            metadata=metadata,
         )
 
         return IngestResponse(
@@ -98,11 +318,11 @@ async def ingest_url(
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
 
 
-@router.post("/yaml", response_model=dict)
+@router.post("/yaml")
 async def ingest_yaml_capabilities(
     file: Annotated[UploadFile, File(description="YAML file with capability definitions")],
     db: AsyncSession = Depends(get_db),
-) -> dict:
+) -> ORJSONResponse:
     """Ingest capabilities from a YAML file.
 
     The YAML file should contain lab and capability definitions
@@ -115,34 +335,40 @@ async def ingest_yaml_capabilities(
     Returns:
         Summary of ingested entities
     """
-    settings = get_settings()
-
-    # Save uploaded file temporarily
-    data_dir = settings.data_dir
-    data_dir.mkdir(parents=True, exist_ok=True)
-    file_path = data_dir / file.filename
-
+    # YAML files are small, so they are parsed from memory rather than via a
+    # temp file. The path still identifies the source for re-imports.
+    file_path = _upload_path(settings.data_dir, file.filename)
+    _check_upload_size(file)
     content = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
 
     try:
         ingestion_service = get_ingestion_service(db)
         labs, facilities, capabilities = await ingestion_service.ingest_yaml_capabilities(
             file_path=file_path,
+            content=content,
         )
 
-        # Clean up temp file
-        file_path.unlink()
-
-        return {
+        return ORJSONResponse({
             "message": "Successfully ingested capabilities from YAML",
             "labs_created": labs,
             "facilities_created": facilities,
             "capabilities_created": capabilities,
-        }
+        })
     except Exception as e:
-        # Clean up temp file on error
-        if file_path.exists():
-            file_path.unlink()
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
+
+
+@router.get("/status/{job_id}", response_model=IngestJobStatus)
+async def get_ingest_status(job_id: str) -> IngestJobStatus:
+    """Get the status of a background ingestion job.
+
+    Args:
+        job_id: Job ID returned by a background ingestion request
+
+    Returns:
+        Current job status
+    """
+    job = _ingest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return job
@@ -1,23 +1,48 @@
 """Sources API router."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import delete, exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import SourceChunk, SourceDocument
 from app.models.database import get_db
 from app.models.schemas import SourceChunkResponse, SourceDocumentResponse
+from app.services.cache import sources_cache
 from app.services.retrieval import get_retrieval_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/sources", tags=["sources"])
 
+# Built once so list responses reuse the compiled serializers
+SOURCE_LIST_ADAPTER = TypeAdapter(list[SourceDocumentResponse])
+CHUNK_LIST_ADAPTER = TypeAdapter(list[SourceChunkResponse])
+
+# Read-only listing: project columns so no ORM objects or identity-map
+# entries are created. Built once; offset/limit are bound parameters.
+LIST_SOURCES_QUERY = (
+    select(
+        SourceDocument.id,
+        SourceDocument.type,
+        SourceDocument.title,
+        SourceDocument.url_or_path,
+        SourceDocument.metadata_,
+        SourceDocument.ingested_at,
+    )
+    .order_by(SourceDocument.ingested_at.desc())
+)
+
 
 @router.get("", response_model=list[SourceDocumentResponse])
 async def list_sources(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     db: AsyncSession = Depends(get_db),
-) -> list[SourceDocumentResponse]:
+) -> Response:
     """List all source documents.
 
     Args:
@@ -28,21 +53,35 @@ async def list_sources(
     Returns:
         List of source documents
     """
-    result = await db.execute(
-        select(SourceDocument)
-        .order_by(SourceDocument.ingested_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    sources = result.scalars().all()
-    return [SourceDocumentResponse.model_validate(s) for s in sources]
+    cache_key = ("list", skip, limit)
+    body = sources_cache.get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
+    version = sources_cache.version
+    result = await db.execute(LIST_SOURCES_QUERY.offset(skip).limit(limit))
+    # Trusted database rows: skip validation
+    sources = [
+        SourceDocumentResponse.model_construct(
+            id=row.id,
+            type=row.type,
+            title=row.title,
+            url_or_path=row.url_or_path,
+            metadata_=row.metadata_,
+            ingested_at=row.ingested_at,
+        )
+        for row in result.all()
+    ]
+    body = SOURCE_LIST_ADAPTER.dump_json(sources, by_alias=True)
+    sources_cache.set(cache_key, body, version)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{source_id}", response_model=SourceDocumentResponse)
 async def get_source(
     source_id: str,
     db: AsyncSession = Depends(get_db),
-) -> SourceDocumentResponse:
+) -> Response:
     """Get a specific source document.
 
     Args:
@@ -52,10 +91,18 @@ async def get_source(
     Returns:
         Source document details
     """
+    cache_key = ("detail", source_id)
+    body = sources_cache.get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
+    version = sources_cache.version
     source = await db.get(SourceDocument, source_id)
     if not source:
         raise HTTPException(status_code=404, detail="Source document not found")
-    return SourceDocumentResponse.model_validate(source)
+    body = SourceDocumentResponse.model_validate(source).model_dump_json(by_alias=True).encode()
+    sources_cache.set(cache_key, body, version)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{source_id}/chunks", response_model=list[SourceChunkResponse])
@@ -63,29 +110,39 @@ async def get_source_chunks(
     source_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    after_index: int | None = Query(
+        None, description="Return chunks after this chunk_index (keyset pagination)"
+    ),
     db: AsyncSession = Depends(get_db),
-) -> list[SourceChunkResponse]:
+) -> Response:
     """Get chunks for a source document.
 
     Args:
         source_id: Source document ID
         skip: Number of results to skip
         limit: Maximum number of results
+        after_index: Optional chunk_index cursor from the previous page
         db: Database session
 
     Returns:
         List of source chunks
     """
-    # Verify source exists
-    source = await db.get(SourceDocument, source_id)
-    if not source:
-        raise HTTPException(status_code=404, detail="Source document not found")
-
     retrieval_service = get_retrieval_service(db)
-    chunks = await retrieval_service.get_source_chunks(source_id)
+    chunks = await retrieval_service.get_source_chunks(
+        source_id, skip=skip, limit=limit, after_index=after_index
+    )
+
+    # Only an empty page needs a second query to tell 404 from "no more chunks"
+    if not chunks:
+        source_exists = await db.scalar(
+            select(exists().where(SourceDocument.id == source_id))
+        )
+        if not source_exists:
+            raise HTTPException(status_code=404, detail="Source document not found")
 
-    return [
-        SourceChunkResponse(
+    # Trusted database rows: skip validation
+    chunk_responses = [
+        SourceChunkResponse.model_construct(
             id=chunk.id,
             source_document_id=chunk.source_document_id,
             text=chunk.text,
@@ -93,15 +150,19 @@ async def get_source_chunks(
             chunk_index=chunk.chunk_index,
             created_at=chunk.created_at,
         )
-        for chunk in chunks[skip : skip + limit]
+        for chunk in chunks
     ]
+    return Response(
+        content=CHUNK_LIST_ADAPTER.dump_json(chunk_responses, by_alias=True),
+        media_type="application/json",
+    )
 
 
 @router.delete("/{source_id}")
 async def delete_source(
     source_id: str,
     db: AsyncSession = Depends(get_db),
-) -> dict:
+) -> ORJSONResponse:
     """Delete a source document and its chunks.
 
     Args:
@@ -113,19 +174,34 @@ async def delete_source(
     """
     from app.services.embeddings import get_embedding_service
 
-    source = await db.get(SourceDocument, source_id)
-    if not source:
+    # Bulk deletes skip the ORM cascade, so chunks are removed explicitly
+    chunk_result = await db.execute(
+        delete(SourceChunk).where(SourceChunk.source_document_id == source_id)
+    )
+    result = await db.execute(
+        delete(SourceDocument)
+        .where(SourceDocument.id == source_id)
+        .returning(SourceDocument.title)
+    )
+    title = result.scalar_one_or_none()
+    if title is None:
         raise HTTPException(status_code=404, detail="Source document not found")
 
-    # Delete embeddings from vector store
-    embedding_service = get_embedding_service()
-    chunks_deleted = await embedding_service.delete_document_chunks(source_id)
-
-    # Delete from database (cascades to chunks)
-    await db.delete(source)
     await db.commit()
-
-    return {
-        "message": f"Deleted source document '{source.title}'",
-        "chunks_deleted": chunks_deleted,
-    }
+    # Bulk DELETE bypasses the mapper events that invalidate the cache
+    sources_cache.invalidate()
+
+    # Vectors are only removed once the database delete has committed. A
+    # failure only leaves orphaned vectors (search shows them with an
+    # unknown source), so it is logged rather than failing a delete that
+    # has already happened.
+    try:
+        await get_embedding_service().delete_document_chunks(source_id)
+    except Exception:
+        logger.exception("Failed to delete vector chunks of source %s", source_id)
+
+    return ORJSONResponse({
+        "message": f"Deleted source document '{title}'",
+        # The vector store holds the same chunks as the database
+        "chunks_deleted": chunk_result.rowcount,
+    })
@@ -0,0 +1,120 @@
+"""In-process caches for rendered JSON responses, searches and plans."""
+
+import time
+from collections.abc import Hashable
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction, object_session
+
+from app.models import Capability, Conversation, Facility, Lab, SourceDocument
+
+# Session.info key of the caches to invalidate when the session commits
+PENDING_INVALIDATIONS_KEY = "pending_cache_invalidations"
+
+
+class ResponseCache:
+    """Cache of rendered response bodies (or other results that callers do
+    not mutate) with TTL and write invalidation.
+
+    Each entry records the cache version it was rendered at; ``invalidate``
+    bumps the version so older entries are never served again. The TTL
+    bounds staleness for writes this process does not see (e.g. the ingest
+    CLI or another worker).
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.version = 0
+        self._entries: dict[Hashable, tuple[int, float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached body for key, or None if missing or stale."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        version, stored_at, body = entry
+        if version != self.version or time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        return body
+
+    def set(self, key: Hashable, body: Any, version: int) -> None:
+        """Store a body rendered at ``version``.
+
+        Bodies rendered before an invalidation are dropped. Writes
+        invalidate once they commit (see ``invalidate_after_commit``), so a
+        request that read rows before a write committed cannot cache them.
+        """
+        if version != self.version:
+            return
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (version, time.monotonic(), body)
+
+    def invalidate(self) -> None:
+        """Drop all entries."""
+        self.version += 1
+        self._entries.clear()
+
+    def invalidate_after_commit(self, session: Session | AsyncSession) -> None:
+        """Invalidate once the session's transaction commits.
+
+        Until then other sessions still read the old rows; invalidating at
+        flush time would let them cache those rows under the new version.
+        """
+        if isinstance(session, AsyncSession):
+            session = session.sync_session
+        session.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).add(self)
+
+    def invalidate_on_write(self, *models: type) -> None:
+        """Invalidate whenever the ORM inserts, updates or deletes a model row.
+
+        The cache is invalidated when the writing session commits. Bulk
+        UPDATE/DELETE statements bypass mapper events; callers issuing them
+        must call ``invalidate_after_commit``, or ``invalidate`` after
+        committing.
+        """
+
+        def _invalidate(mapper, connection, target) -> None:
+            self.invalidate_after_commit(object_session(target))
+
+        for model in models:
+            for event_name in ("after_insert", "after_update", "after_delete"):
+                event.listen(model, event_name, _invalidate)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    """Invalidate the caches written to by a committed transaction."""
+    for cache in session.info.pop(PENDING_INVALIDATIONS_KEY, ()):
+        cache.invalidate()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction: SessionTransaction) -> None:
+    """Forget pending invalidations when the outermost transaction rolls back."""
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+
+
+# Rendered /labs payload and its ETag
+labs_cache = ResponseCache()
+labs_cache.invalidate_on_write(Lab)
+
+# Rendered /conversations and /sources responses
+conversations_cache = ResponseCache()
+conversations_cache.invalidate_on_write(Conversation)
+
+sources_cache = ResponseCache()
+sources_cache.invalidate_on_write(SourceDocument)
+
+# Vector search results; the embedding service invalidates it whenever it
+# adds or deletes chunks
+search_cache = ResponseCache()
+
+# Generated plans, which depend on the capability registry
+plan_cache = ResponseCache(ttl_seconds=900.0, max_entries=128)
+plan_cache.invalidate_on_write(Capability, Facility)
@@ -1,8 +1,7 @@
 """Chat orchestration service for the OPAL assistant."""
 
-import json
 import logging
-import uuid
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Optional
 
@@ -10,19 +9,22 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.orm import defer
 
 from app.models import Conversation
+from app.models.conversation import make_preview
+from app.models.database import async_session_maker, json_array_append, uuid7
 from app.models.schemas import (
+    CapabilitySearchResult,
     ChatMessage,
     ChatResponse,
-    Citation,
     OPALPlan,
-    PlanStep,
-    RiskItem,
     SearchResult,
 )
-from app.services.llm import get_llm_service
+from app.services.cache import conversations_cache
+from app.services.embeddings import make_quote
+from app.services.llm import EPHEMERAL_CACHE_CONTROL, cache_block, get_llm_service
 from app.services.retrieval import RetrievalService, get_retrieval_service
 
 
@@ -56,6 +58,192 @@ You have access to these tools:
 
 Always be helpful, scientifically rigorous, and honest about limitations."""
 
+# The system prompt and tool definitions are identical on every turn, so they
+# are sent as a cached prompt prefix; only the conversation varies.
+SYSTEM_BLOCKS = [cache_block(SYSTEM_PROMPT)]
+
+# Tool definitions for the LLM. Built once: the list is identical on every
+# turn and is never mutated.
+TOOLS = [
+    {
+        "name": "search_capabilities",
+        "description": "Search the OPAL capability registry for relevant capabilities, facilities, and labs. Use this to find what resources are available across the OPAL network.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Natural language search query describing the capability needed",
+                },
+                "modality": {
+                    "type": "string",
+                    "description": "Optional filter by modality (e.g., 'phenotyping', 'sequencing', 'proteomics')",
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional filter by tags",
+                },
+            },
+            "required": ["query"],
+        },
+    },
+    {
+        "name": "get_lab_info",
+        "description": "Get detailed information about a specific OPAL member lab",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "lab_name": {
+                    "type": "string",
+                    "description": "Name of the lab to look up",
+                },
+            },
+            "required": ["lab_name"],
+        },
+    },
+    {
+        "name": "create_plan",
+        "description": "Create a structured OPAL Resource Deployment Plan. Call this when you have gathered enough information and are ready to propose a plan.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "goal_summary": {
+                    "type": "string",
+                    "description": "Brief summary of the research goal",
+                },
+                "assumptions": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Key assumptions made in the plan",
+                },
+                "steps": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "step_id": {"type": "string"},
+                            "objective": {"type": "string"},
+                            "recommended_facility": {"type": "string"},
+                            "capability_ids": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                            },
+                            "inputs": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                            },
+                            "outputs": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                            },
+                            "constraints": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                            },
+                            "dependencies": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                            },
+                            "decision_points": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                            },
+                            "citations": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "source_document_id": {"type": "string"},
+                                        "quote": {"type": "string"},
+                                    },
+                                },
+                            },
+                            "is_hypothesis": {"type": "boolean"},
+                        },
+                        "required": ["step_id", "objective", "recommended_facility"],
+                    },
+                },
+                "open_questions": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                },
+                "risks_and_alternatives": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "risk": {"type": "string"},
+                            "impact": {"type": "string"},
+                            "alternative": {"type": "string"},
+                        },
+                    },
+                },
+            },
+            "required": ["goal_summary", "steps"],
+        },
+        # Cache breakpoint after the last tool covers all definitions
+        "cache_control": EPHEMERAL_CACHE_CONTROL,
+    },
+]
+
+
+# Citations included per capability in tool results
+TOOL_CITATIONS_PER_CAPABILITY = 2
+
+
+def _capability_tool_result(result: CapabilitySearchResult) -> dict:
+    """Project a capability search result into the search tool's output.
+
+    Args:
+        result: Capability search result
+
+    Returns:
+        JSON-serializable capability summary with its leading citations
+    """
+    capability = result.capability
+    citations = []
+    for chunk in result.source_chunks[:TOOL_CITATIONS_PER_CAPABILITY]:
+        # Chunks ingested before quotes were stored are truncated here
+        quote = (chunk.metadata or {}).get("quote")
+        citations.append({
+            "chunk_id": chunk.chunk_id,
+            "source_document_id": chunk.source_document_id,
+            "source_title": chunk.source_title,
+            "quote": quote if quote is not None else make_quote(chunk.text),
+        })
+    return {
+        "name": capability.name,
+        "description": capability.description,
+        "facility": capability.facility_name,
+        "lab": capability.lab_name,
+        "institution": capability.lab_institution,
+        "modalities": capability.modalities,
+        "throughput": capability.throughput,
+        "constraints": capability.constraints,
+        "relevance_score": result.relevance_score,
+        "citations": citations,
+    }
+
+
+def _llm_messages(conversation: list[dict]) -> list[dict]:
+    """Prepare the stored conversation for the LLM with a history cache breakpoint.
+
+    The newest user message ends a cached prefix, so the tool rounds of
+    this turn and the next turn (whose prefix contains it) read the
+    history from the prompt cache instead of paying for it again. The
+    breakpoint moves forward each turn; the API looks back from it for
+    the previous turn's cache entry. Stored messages are not modified.
+
+    Args:
+        conversation: Messages so far, ending with the new user message
+
+    Returns:
+        Messages to send to the LLM
+    """
+    *history, latest = conversation
+    return [*history, {"role": latest["role"], "content": [cache_block(latest["content"])]}]
+
 
 CLARIFYING_QUESTIONS = [
     "What is your target organism or chassis strain (e.g., E. coli, Pseudomonas, yeast)?",
@@ -73,348 +261,320 @@ class ChatService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.llm_service = get_llm_service()
-        self.retrieval_service = get_retrieval_service(db)
 
     def _get_tools(self) -> list[dict]:
         """Get tool definitions for the LLM."""
-        return [
-            {
-                "name": "search_capabilities",
-                "description": "Search the OPAL capability registry for relevant capabilities, facilities, and labs. Use this to find what resources are available across the OPAL network.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "Natural language search query describing the capability needed",
-                        },
-                        "modality": {
-                            "type": "string",
-                            "description": "Optional filter by modality (e.g., 'phenotyping', 'sequencing', 'proteomics')",
-                        },
-                        "tags": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Optional filter by tags",
-                        },
-                    },
-                    "required": ["query"],
-                },
-            },
-            {
-                "name": "get_lab_info",
-                "description": "Get detailed information about a specific OPAL member lab",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "lab_name": {
-                            "type": "string",
-                            "description": "Name of the lab to look up",
-                        },
-                    },
-                    "required": ["lab_name"],
-                },
-            },
-            {
-                "name": "create_plan",
-                "description": "Create a structured OPAL Resource Deployment Plan. Call this when you have gathered enough information and are ready to propose a plan.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "goal_summary": {
-                            "type": "string",
-                            "description": "Brief summary of the research goal",
-                        },
-                        "assumptions": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Key assumptions made in the plan",
-                        },
-                        "steps": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "step_id": {"type": "string"},
-                                    "objective": {"type": "string"},
-                                    "recommended_facility": {"type": "string"},
-                                    "capability_ids": {
-                                        "type": "array",
-                                        "items": {"type": "string"},
-                                    },
-                                    "inputs": {
-                                        "type": "array",
-                                        "items": {"type": "string"},
-                                    },
-                                    "outputs": {
-                                        "type": "array",
-                                        "items": {"type": "string"},
-                                    },
-                                    "constraints": {
-                                        "type": "array",
-                                        "items": {"type": "string"},
-                                    },
-                                    "dependencies": {
-                                        "type": "array",
-                                        "items": {"type": "string"},
-                                    },
-                                    "decision_points": {
-                                        "type": "array",
-                                        "items": {"type": "string"},
-                                    },
-                                    "citations": {
-                                        "type": "array",
-                                        "items": {
-                                            "type": "object",
-                                            "properties": {
-                                                "source_document_id": {"type": "string"},
-                                                "quote": {"type": "string"},
-                                            },
-                                        },
-                                    },
-                                    "is_hypothesis": {"type": "boolean"},
-                                },
-                                "required": ["step_id", "objective", "recommended_facility"],
-                            },
-                        },
-                        "open_questions": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                        },
-                        "risks_and_alternatives": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "risk": {"type": "string"},
-                                    "impact": {"type": "string"},
-                                    "alternative": {"type": "string"},
-                                },
-                            },
-                        },
-                    },
-                    "required": ["goal_summary", "steps"],
-                },
-            },
-        ]
+        return TOOLS
 
     async def _execute_tool(self, tool_name: str, tool_input: dict) -> dict:
         """Execute a tool and return the result."""
-        logger.info(f"Executing tool: {tool_name} with input: {tool_input}")
+        logger.info("Executing tool: %s", tool_name)
         try:
             result = await self._execute_tool_impl(tool_name, tool_input)
-            logger.info(f"Tool {tool_name} returned: {str(result)[:200]}...")
+            # Stringifying tool inputs/results is costly, so only do it at DEBUG
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Tool %s input: %s", tool_name, tool_input)
+                logger.debug("Tool %s returned: %s...", tool_name, str(result)[:200])
             return result
         except Exception as e:
-            logger.error(f"Tool {tool_name} failed: {e}", exc_info=True)
+            logger.error("Tool %s failed: %s", tool_name, e, exc_info=True)
             return {"error": str(e)}
 
     async def _execute_tool_impl(self, tool_name: str, tool_input: dict) -> dict:
-        """Internal tool execution implementation."""
-        if tool_name == "search_capabilities":
-            results = await self.retrieval_service.search_capabilities(
-                query=tool_input["query"],
-                modality=tool_input.get("modality"),
-                tags=tool_input.get("tags"),
-                top_k=10,
-            )
-            return {
-                "capabilities": [
-                    {
-                        "name": r.capability.name,
-                        "description": r.capability.description,
-                        "facility": r.capability.facility_name,
-                        "lab": r.capability.lab_name,
-                        "institution": r.capability.lab_institution,
-                        "modalities": r.capability.modalities,
-                        "throughput": r.capability.throughput,
-                        "constraints": r.capability.constraints,
-                        "relevance_score": r.relevance_score,
-                        "citations": [
-                            {
-                                "source_document_id": c.source_document_id,
-                                "source_title": c.source_title,
-                                "quote": c.text[:200] + "..." if len(c.text) > 200 else c.text,
-                            }
-                            for c in r.source_chunks[:2]
-                        ],
-                    }
-                    for r in results
-                ]
-            }
-
-        elif tool_name == "get_lab_info":
-            labs = await self.retrieval_service.get_all_labs()
-            lab_name = tool_input["lab_name"].lower()
-            for lab in labs:
-                if lab_name in lab.name.lower():
-                    capabilities = await self.retrieval_service.get_lab_capabilities(lab.id)
-                    return {
-                        "name": lab.name,
-                        "institution": lab.institution,
-                        "location": lab.location,
-                        "description": lab.description,
-                        "capabilities": [
-                            {
-                                "name": c.name,
-                                "description": c.description,
-                                "modalities": c.modalities,
-                            }
-                            for c in capabilities
-                        ],
-                    }
-            return {"error": f"Lab '{tool_input['lab_name']}' not found"}
+        """Internal tool execution implementation.
 
-        elif tool_name == "create_plan":
+        The tool calls of one LLM response run concurrently, and a session
+        cannot run concurrent queries, so database-backed tools each query
+        on a session of their own rather than self.db.
+        """
+        if tool_name == "create_plan":
             # The LLM provides the plan structure, we just validate and return it
             return {"status": "plan_created", "plan": tool_input}
 
-        return {"error": f"Unknown tool: {tool_name}"}
+        if tool_name not in ("search_capabilities", "get_lab_info"):
+            return {"error": f"Unknown tool: {tool_name}"}
+
+        async with async_session_maker() as session:
+            retrieval_service = get_retrieval_service(session)
+
+            if tool_name == "search_capabilities":
+                results = await retrieval_service.search_capabilities(
+                    query=tool_input["query"],
+                    modality=tool_input.get("modality"),
+                    tags=tool_input.get("tags"),
+                    top_k=10,
+                )
+                return {"capabilities": [_capability_tool_result(r) for r in results]}
+
+            # get_lab_info: matched in SQL rather than by loading and scanning every lab
+            lab = await retrieval_service.find_lab_by_name(tool_input["lab_name"])
+            if lab:
+                capabilities = await retrieval_service.get_lab_capabilities(lab.id)
+                return {
+                    "name": lab.name,
+                    "institution": lab.institution,
+                    "location": lab.location,
+                    "description": lab.description,
+                    "capabilities": [
+                        {
+                            "name": c.name,
+                            "description": c.description,
+                            "modalities": c.modalities,
+                        }
+                        for c in capabilities
+                    ],
+                }
+            return {"error": f"Lab '{tool_input['lab_name']}' not found"}
 
-    async def chat(
-        self,
-        message: str,
-        conversation_id: Optional[str] = None,
-    ) -> ChatResponse:
-        """Process a chat message and return a response.
+    async def _load_conversation(
+        self, conversation_id: Optional[str]
+    ) -> tuple[Conversation, bool]:
+        """Get a stored conversation, or start a new unsaved one.
 
         Args:
-            message: User's message
             conversation_id: Optional conversation ID for continuity
 
         Returns:
-            ChatResponse with message, plan (if created), and sources
+            Tuple of (conversation record, whether it is new)
         """
-        # Get or create conversation from database
         conversation_record = None
         if conversation_id:
-            result = await self.db.execute(
-                select(Conversation).where(Conversation.id == conversation_id)
+            # The stored plan and sources are only ever overwritten or
+            # appended to here, so their JSON is not fetched; raiseload flags
+            # any accidental read. get() skips the query when the row is
+            # already in this session.
+            conversation_record = await self.db.get(
+                Conversation,
+                conversation_id,
+                options=[
+                    defer(Conversation.plan, raiseload=True),
+                    defer(Conversation.sources, raiseload=True),
+                ],
             )
-            conversation_record = result.scalar_one_or_none()
 
-        if not conversation_record:
-            # Create new conversation
-            conversation_id = str(uuid.uuid4())
+        is_new = conversation_record is None
+        if is_new:
+            # Create new conversation. It is added to the session only after
+            # the LLM call, so no write transaction is held open (and SQLite
+            # stays unlocked) while the response is generated.
             conversation_record = Conversation(
-                id=conversation_id,
+                id=uuid7(),
                 messages=[],
+                source_chunk_ids=[],
             )
-            self.db.add(conversation_record)
-            await self.db.flush()
-            logger.info(f"Created new conversation: {conversation_id}")
+            logger.info("Created new conversation: %s", conversation_record.id)
         else:
-            logger.info(f"Found existing conversation: {conversation_id} with {len(conversation_record.messages)} messages")
+            logger.info(
+                "Found existing conversation: %s with %d messages",
+                conversation_id,
+                len(conversation_record.messages),
+            )
 
-        # Get messages list from record
-        conversation = list(conversation_record.messages)
+        return conversation_record, is_new
 
-        # Add user message
-        conversation.append({"role": "user", "content": message})
+    async def _stored_source_chunk_ids(self, conversation_record: Conversation) -> list[str]:
+        """Get the chunk IDs of the sources already stored on a conversation.
 
-        # Generate response with tools using async tool executor
-        response = await self.llm_service.generate_with_tools(
-            messages=conversation,
-            tools=self._get_tools(),
-            system=SYSTEM_PROMPT,
-            tool_executor=self._execute_tool,
+        Args:
+            conversation_record: Conversation whose sources column is deferred
+
+        Returns:
+            Stored source chunk IDs
+        """
+        if conversation_record.source_chunk_ids is not None:
+            return conversation_record.source_chunk_ids
+        # Rows written before source_chunk_ids existed: read the sources blob
+        stored_sources = await self.db.scalar(
+            select(Conversation.sources).where(Conversation.id == conversation_record.id)
         )
+        return [s.get("chunk_id") for s in stored_sources or []]
+
+    async def _save_turn(
+        self,
+        conversation_record: Conversation,
+        is_new: bool,
+        conversation: list[dict],
+        response: dict,
+    ) -> ChatResponse:
+        """Persist a completed turn and build its ChatResponse.
+
+        Args:
+            conversation_record: Conversation the turn belongs to
+            is_new: Whether the record has not been saved yet
+            conversation: Messages so far, ending with this turn's user message
+            response: Final response from the LLM tool use loop
 
-        # Extract plan if created
-        plan = None
+        Returns:
+            ChatResponse with message, plan (if created), and sources
+        """
+        first_user_msg = next(m["content"] for m in conversation if m["role"] == "user")
+
+        # One pass over the tool results: only the last plan is parsed, and
+        # sources are deduplicated by chunk as they are collected
+        plan_data = None
         sources = []
+        seen_chunk_ids = set()
         for tool_result in response.get("all_tool_results", []):
             if tool_result["tool_name"] == "create_plan":
                 plan_data = tool_result["tool_result"].get("plan", {})
-                plan = self._parse_plan(plan_data)
             elif tool_result["tool_name"] == "search_capabilities":
                 # Extract sources from search results
                 for cap in tool_result["tool_result"].get("capabilities", []):
                     for citation in cap.get("citations", []):
+                        chunk_id = citation.get("chunk_id", "")
+                        if chunk_id in seen_chunk_ids:
+                            continue
+                        seen_chunk_ids.add(chunk_id)
                         sources.append(SearchResult(
-                            chunk_id="",
+                            chunk_id=chunk_id,
                             source_document_id=citation.get("source_document_id", ""),
                             source_title=citation.get("source_title", ""),
                             text=citation.get("quote", ""),
                             score=cap.get("relevance_score", 0),
                             metadata={},
                         ))
+        plan = self._parse_plan(plan_data) if plan_data is not None else None
 
         # Add assistant message to conversation
-        conversation.append({"role": "assistant", "content": response["content"]})
+        user_message = conversation[-1]
+        assistant_message = {"role": "assistant", "content": response["content"]}
+        conversation.append(assistant_message)
 
-        # Persist conversation to database
-        conversation_record.messages = conversation
+        # Collect the changed columns
+        values = {"message_count": len(conversation)}
         if plan:
             # Use mode='json' to ensure datetime objects are serialized as strings
-            conversation_record.plan = plan.model_dump(mode='json') if hasattr(plan, 'model_dump') else None
+            values["plan"] = plan.model_dump(mode='json')
 
-        # Persist sources (append new sources to existing)
+        # Persist sources (append new sources to existing), skipping chunks
+        # already stored
+        new_sources = []
+        new_chunk_ids = []
         if sources:
-            existing_sources = conversation_record.sources or []
-            existing_ids = {s.get("chunk_id") for s in existing_sources}
-            new_sources = [
-                s.model_dump(mode='json') if hasattr(s, 'model_dump') else s
-                for s in sources
-                if (s.chunk_id if hasattr(s, 'chunk_id') else s.get("chunk_id")) not in existing_ids
-            ]
-            conversation_record.sources = existing_sources + new_sources
+            stored_ids = await self._stored_source_chunk_ids(conversation_record)
+            stored_id_set = set(stored_ids)
+            for source in sources:
+                if source.chunk_id not in stored_id_set:
+                    new_chunk_ids.append(source.chunk_id)
+                    new_sources.append(source.model_dump(mode='json'))
+            if conversation_record.source_chunk_ids is None:
+                # First write for a row that predates source_chunk_ids
+                values["source_chunk_ids"] = stored_ids + new_chunk_ids
+            elif not is_new:
+                values["source_chunk_ids"] = json_array_append(
+                    Conversation.source_chunk_ids, new_chunk_ids
+                )
+
+        if conversation_record.preview is None:
+            values["preview"] = make_preview(first_user_msg)
 
         # Auto-generate title from first user message if not set
-        if not conversation_record.title and len(conversation) >= 1:
-            first_user_msg = next((m["content"] for m in conversation if m["role"] == "user"), None)
-            if first_user_msg:
-                conversation_record.title = first_user_msg[:100] + ("..." if len(first_user_msg) > 100 else "")
-
+        if not conversation_record.title:
+            values["title"] = first_user_msg[:100] + ("..." if len(first_user_msg) > 100 else "")
+
+        if is_new:
+            conversation_record.messages = conversation
+            conversation_record.sources = new_sources
+            conversation_record.source_chunk_ids = new_chunk_ids
+            for key, value in values.items():
+                setattr(conversation_record, key, value)
+            self.db.add(conversation_record)
+        else:
+            # Append only this turn's messages and sources in SQL rather than
+            # re-sending the whole history
+            await self.db.execute(
+                update(Conversation)
+                .where(Conversation.id == conversation_record.id)
+                .values(
+                    messages=json_array_append(
+                        Conversation.messages, [user_message, assistant_message]
+                    ),
+                    sources=json_array_append(Conversation.sources, new_sources),
+                    **values,
+                )
+                .execution_options(synchronize_session=False)
+            )
         await self.db.commit()
+        if not is_new:
+            # Bulk UPDATE bypasses the mapper events that invalidate the cache
+            conversations_cache.invalidate()
 
         return ChatResponse(
             message=response["content"],
-            conversation_id=conversation_id,
+            conversation_id=conversation_record.id,
             plan=plan,
             sources=sources,
         )
 
-    def _parse_plan(self, plan_data: dict) -> OPALPlan:
-        """Parse plan data from tool call into OPALPlan object."""
-        steps = []
-        for step_data in plan_data.get("steps", []):
-            citations = []
-            for cit in step_data.get("citations", []):
-                citations.append(Citation(
-                    source_document_id=cit.get("source_document_id", ""),
-                    quote=cit.get("quote", ""),
-                ))
-            steps.append(PlanStep(
-                step_id=step_data.get("step_id", ""),
-                objective=step_data.get("objective", ""),
-                recommended_facility=step_data.get("recommended_facility", ""),
-                capability_ids=step_data.get("capability_ids", []),
-                inputs=step_data.get("inputs", []),
-                outputs=step_data.get("outputs", []),
-                constraints=step_data.get("constraints", []),
-                dependencies=step_data.get("dependencies", []),
-                decision_points=step_data.get("decision_points", []),
-                citations=citations,
-                is_hypothesis=step_data.get("is_hypothesis", False),
-            ))
-
-        risks = []
-        for risk_data in plan_data.get("risks_and_alternatives", []):
-            risks.append(RiskItem(
-                risk=risk_data.get("risk", ""),
-                impact=risk_data.get("impact", ""),
-                alternative=risk_data.get("alternative"),
-            ))
-
-        return OPALPlan(
-            goal_summary=plan_data.get("goal_summary", ""),
-            assumptions=plan_data.get("assumptions", []),
-            steps=steps,
-            open_questions=plan_data.get("open_questions", []),
-            risks_and_alternatives=risks,
+    async def chat(
+        self,
+        message: str,
+        conversation_id: Optional[str] = None,
+    ) -> ChatResponse:
+        """Process a chat message and return a response.
+
+        Args:
+            message: User's message
+            conversation_id: Optional conversation ID for continuity
+
+        Returns:
+            ChatResponse with message, plan (if created), and sources
+        """
+        conversation_record, is_new = await self._load_conversation(conversation_id)
+        conversation = list(conversation_record.messages)
+        conversation.append({"role": "user", "content": message})
+
+        # Generate response with tools using async tool executor
+        response = await self.llm_service.generate_with_tools(
+            messages=_llm_messages(conversation),
+            tools=self._get_tools(),
+            system=SYSTEM_BLOCKS,
+            tool_executor=self._execute_tool,
         )
 
+        return await self._save_turn(conversation_record, is_new, conversation, response)
+
+    async def chat_stream(
+        self,
+        message: str,
+        conversation_id: Optional[str] = None,
+    ) -> AsyncIterator[str | ChatResponse]:
+        """Process a chat message, streaming the reply as it is generated.
+
+        Args:
+            message: User's message
+            conversation_id: Optional conversation ID for continuity
+
+        Yields:
+            Text deltas as they arrive from the LLM, then the ChatResponse
+            once the turn has been saved
+        """
+        conversation_record, is_new = await self._load_conversation(conversation_id)
+        conversation = list(conversation_record.messages)
+        conversation.append({"role": "user", "content": message})
+
+        response = None
+        async for event in self.llm_service.stream_with_tools(
+            messages=_llm_messages(conversation),
+            tools=self._get_tools(),
+            system=SYSTEM_BLOCKS,
+            tool_executor=self._execute_tool,
+        ):
+            if event["type"] == "text":
+                yield event["text"]
+            else:
+                response = event["response"]
+
+        yield await self._save_turn(conversation_record, is_new, conversation, response)
+
+    def _parse_plan(self, plan_data: dict) -> OPALPlan:
+        """Parse plan data from tool call into OPALPlan object.
+
+        The whole nested structure is validated in one pydantic-core call;
+        missing keys fall back to the schema defaults.
+        """
+        return OPALPlan.model_validate(plan_data)
+
 
 def get_chat_service(db: AsyncSession) -> ChatService:
     """Get a chat service instance."""
@@ -1,15 +1,53 @@
 """Embedding service using CBORG API."""
 
+import asyncio
 import hashlib
-import json
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 
 import chromadb
 import httpx
+import numpy as np
+import orjson
 from chromadb.config import Settings as ChromaSettings
 
 from app.config import get_settings
+from app.services.cache import search_cache
+
+# Texts per embeddings request, and the most requests in flight at once
+EMBEDDING_BATCH_SIZE = 64
+EMBEDDING_CONCURRENCY = 8
+
+# Connection pool for the embeddings API, kept alive across ingest bursts
+EMBEDDING_HTTP_LIMITS = httpx.Limits(
+    max_connections=32,
+    max_keepalive_connections=32,
+    keepalive_expiry=300.0,
+)
+
+# Query embeddings kept in memory (LRU), keyed by model and text
+QUERY_EMBEDDING_CACHE_SIZE = 512
+
+# Citation quotes are stored pre-truncated in chunk metadata
+QUOTE_LENGTH = 200
+
+
+def make_quote(text: str) -> str:
+    """Truncate chunk text to a citation quote."""
+    return text[:QUOTE_LENGTH] + "..." if len(text) > QUOTE_LENGTH else text
+
+
+# HNSW index settings for the chunk collection. Cosine space matches the
+# 1 - distance similarity score in search(). Chroma fixes these when a
+# collection is created, so an existing collection keeps its settings
+# until the vector store is rebuilt.
+CHUNK_COLLECTION_HNSW = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+}
 
 
 class EmbeddingService:
@@ -20,6 +58,10 @@ class EmbeddingService:
         self._client: Optional[httpx.AsyncClient] = None
         self._chroma_client: Optional[chromadb.Client] = None
         self._collection: Optional[chromadb.Collection] = None
+        # Shared by all callers so concurrent ingests stay within the limit
+        self._semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+        self._embedding_cache: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self._pending_embeddings: dict[tuple[str, str], asyncio.Task] = {}
 
     @property
     def client(self) -> httpx.AsyncClient:
@@ -32,6 +74,13 @@ class EmbeddingService:
                     "Content-Type": "application/json",
                 },
                 timeout=120.0,  # Increased timeout for embedding API
+                # HTTP/2 multiplexes concurrent batches over one kept-alive
+                # TLS connection; limits must be set on a custom transport
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True,
+                    limits=EMBEDDING_HTTP_LIMITS,
+                    retries=2,
+                ),
             )
         return self._client
 
@@ -53,55 +102,139 @@ class EmbeddingService:
         if self._collection is None:
             self._collection = self.chroma_client.get_or_create_collection(
                 name="source_chunks",
-                metadata={"description": "OPAL source document chunks"},
+                metadata={"description": "OPAL source document chunks", **CHUNK_COLLECTION_HNSW},
             )
         return self._collection
 
-    async def generate_embedding(self, text: str) -> list[float]:
-        """Generate embedding for a single text using CBORG API."""
-        response = await self.client.post(
-            "/v1/embeddings",
-            json={
-                "model": self.settings.embedding_model,
-                "input": text,
-            },
-        )
+    async def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Embed one batch of texts in a single CBORG call.
+
+        Returns:
+            float32 array with one row per text
+        """
+        # Request and response bodies are encoded and decoded with orjson;
+        # a response carries a float list per text
+        async with self._semaphore:
+            response = await self.client.post(
+                "/v1/embeddings",
+                content=orjson.dumps({
+                    "model": self.settings.embedding_model,
+                    "input": texts,
+                }),
+            )
         response.raise_for_status()
-        data = response.json()
-        return data["data"][0]["embedding"]
+        data = orjson.loads(response.content)
+        return np.array([item["embedding"] for item in data["data"]], dtype=np.float32)
+
+    async def generate_embedding(self, text: str) -> np.ndarray:
+        """Generate embedding for a single text using CBORG API.
 
-    async def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings for multiple texts."""
+        Results are cached, and concurrent calls for the same text share a
+        single request, so repeated search queries skip the network. The
+        request runs as its own task that every caller awaits through
+        asyncio.shield(), so a cancelled caller (e.g. a disconnected client)
+        does not cancel it for the others.
+        """
+        key = (self.settings.embedding_model, text)
+        embedding = self._embedding_cache.get(key)
+        if embedding is not None:
+            self._embedding_cache.move_to_end(key)
+            return embedding
+
+        task = self._pending_embeddings.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_embedding(key, text))
+            self._pending_embeddings[key] = task
+            task.add_done_callback(lambda done: self._finish_embedding(key, done))
+        return await asyncio.shield(task)
+
+    async def _fetch_embedding(self, key: tuple[str, str], text: str) -> np.ndarray:
+        """Embed one text and add it to the embedding cache."""
+        embedding = (await self._embed_batch([text]))[0]
+        # Shared by every caller that hits the cache
+        embedding.flags.writeable = False
+        self._embedding_cache[key] = embedding
+        if len(self._embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
+        return embedding
+
+    def _finish_embedding(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        """Drop a finished embedding request from the in-flight map."""
+        del self._pending_embeddings[key]
+        if not task.cancelled():
+            # Callers re-raise it; mark it retrieved when none are left
+            task.exception()
+
+    async def generate_embeddings(self, texts: list[str]) -> np.ndarray:
+        """Generate embeddings for multiple texts.
+
+        Inputs are split into batches of EMBEDDING_BATCH_SIZE that are sent
+        concurrently, at most EMBEDDING_CONCURRENCY at a time. Results keep
+        the input order in a single contiguous float32 array, which Chroma
+        takes without converting per-vector Python lists.
+        """
         if not texts:
-            return []
+            return np.empty((0, 0), dtype=np.float32)
 
-        response = await self.client.post(
-            "/v1/embeddings",
-            json={
-                "model": self.settings.embedding_model,
-                "input": texts,
-            },
-        )
-        response.raise_for_status()
-        data = response.json()
-        return [item["embedding"] for item in data["data"]]
+        batches = [
+            texts[i:i + EMBEDDING_BATCH_SIZE]
+            for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(self._embed_batch(batch) for batch in batches))
+        return results[0] if len(results) == 1 else np.concatenate(results)
 
     def _generate_chunk_id(self, source_document_id: str, chunk_index: int, text: str = "") -> str:
         """Generate a deterministic ID for a chunk."""
         # Include text hash to ensure uniqueness even with same index
         content = f"{source_document_id}:{chunk_index}:{text[:100]}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        # Non-cryptographic use: an 8-byte BLAKE2b digest gives the same
+        # 16 hex characters without hashing a full SHA-256 and truncating
+        return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+    def prepare_chunks(
+        self,
+        chunks: list[dict],
+        source_document_id: str,
+        start_index: int = 0,
+    ) -> list[str]:
+        """Stamp chunks' metadata with their document and index, and get their IDs.
+
+        Chunk IDs are deterministic, so callers can store chunk records
+        while the chunks are still being embedded.
+
+        Args:
+            chunks: List of dicts with 'text' and optional 'metadata'; the
+                metadata is updated in place
+            source_document_id: ID of the source document
+            start_index: Document chunk index of the first chunk, when a
+                document's chunks are added in several calls
+
+        Returns:
+            List of chunk IDs
+        """
+        ids = []
+        for i, chunk in enumerate(chunks, start_index):
+            ids.append(self._generate_chunk_id(source_document_id, i, chunk["text"]))
+            metadata = chunk["metadata"] = chunk.get("metadata") or {}
+            metadata["source_document_id"] = source_document_id
+            metadata["chunk_index"] = i
+        return ids
 
     async def add_chunks(
         self,
         chunks: list[dict],
         source_document_id: str,
+        start_index: int = 0,
+        ids: Optional[list[str]] = None,
     ) -> list[str]:
         """Add chunks to the vector store.
 
         Args:
             chunks: List of dicts with 'text' and optional 'metadata'
             source_document_id: ID of the source document
+            start_index: Document chunk index of the first chunk, when a
+                document's chunks are added in several calls
+            ids: Chunk IDs from prepare_chunks(), if already called
 
         Returns:
             List of chunk IDs
@@ -109,28 +242,25 @@ class EmbeddingService:
         if not chunks:
             return []
 
+        if ids is None:
+            ids = self.prepare_chunks(chunks, source_document_id, start_index)
+
         texts = [c["text"] for c in chunks]
         embeddings = await self.generate_embeddings(texts)
 
-        ids = []
-        documents = []
-        metadatas = []
-
-        for i, chunk in enumerate(chunks):
-            chunk_id = self._generate_chunk_id(source_document_id, i, chunk["text"])
-            ids.append(chunk_id)
-            documents.append(chunk["text"])
-            metadata = chunk.get("metadata", {}) or {}
-            metadata["source_document_id"] = source_document_id
-            metadata["chunk_index"] = i
-            metadatas.append(metadata)
+        # The quote is only kept in the vector store, so that citing a
+        # search hit needs no slicing of its text
+        metadatas = [
+            {**c["metadata"], "quote": make_quote(c["text"])} for c in chunks
+        ]
 
         self.collection.add(
             ids=ids,
             embeddings=embeddings,
-            documents=documents,
+            documents=texts,
             metadatas=metadatas,
         )
+        search_cache.invalidate()
 
         return ids
 
@@ -142,6 +272,10 @@ class EmbeddingService:
     ) -> list[dict]:
         """Search for similar chunks.
 
+        The query embedding is cached by generate_embedding(), and the
+        results themselves are cached briefly so repeated searches (planner
+        retries, UI refreshes) skip the vector store too.
+
         Args:
             query: Search query text
             top_k: Number of results to return
@@ -150,14 +284,51 @@ class EmbeddingService:
         Returns:
             List of search results with id, text, score, and metadata
         """
-        query_embedding = await self.generate_embedding(query)
-
         where_filter = None
         if filters:
             where_filter = {k: v for k, v in filters.items() if v is not None}
             if not where_filter:
                 where_filter = None
 
+        # Filter values may be lists or dicts (e.g. {"$in": [...]}), so the
+        # filter is keyed by its canonical JSON encoding
+        filter_key = (
+            orjson.dumps(where_filter, option=orjson.OPT_SORT_KEYS)
+            if where_filter
+            else None
+        )
+        cache_key = (self.settings.embedding_model, query, top_k, filter_key)
+        cached = search_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        version = search_cache.version
+
+        if where_filter and len(where_filter) > 1:
+            # Chroma takes several conditions only when combined with $and
+            where_filter = {"$and": [{k: v} for k, v in where_filter.items()]}
+
+        query_embedding = await self.generate_embedding(query)
+        search_results = await self.search_vector(query_embedding, top_k, where_filter)
+
+        search_cache.set(cache_key, search_results, version)
+        return list(search_results)
+
+    async def search_vector(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 10,
+        where_filter: Optional[dict] = None,
+    ) -> list[dict]:
+        """Search for the chunks nearest to an embedding.
+
+        Args:
+            query_embedding: Embedding of the query
+            top_k: Number of results to return
+            where_filter: Optional Chroma metadata filter
+
+        Returns:
+            List of search results with id, text, score, and metadata
+        """
         results = self.collection.query(
             query_embeddings=[query_embedding],
             n_results=top_k,
@@ -177,17 +348,18 @@ class EmbeddingService:
 
         return search_results
 
-    async def delete_document_chunks(self, source_document_id: str) -> int:
-        """Delete all chunks for a source document."""
-        results = self.collection.get(
-            where={"source_document_id": source_document_id},
-            include=["metadatas"],
-        )
+    async def delete_document_chunks(self, source_document_id: str) -> None:
+        """Delete all chunks for a source document.
 
-        if results["ids"]:
-            self.collection.delete(ids=results["ids"])
-            return len(results["ids"])
-        return 0
+        Chunks are deleted by their source_document_id metadata in one call,
+        without first fetching their IDs. The Chroma client is synchronous,
+        so the delete runs in a worker thread and callers can overlap it with
+        other I/O.
+        """
+        await asyncio.to_thread(
+            self.collection.delete, where={"source_document_id": source_document_id}
+        )
+        search_cache.invalidate()
 
     async def close(self):
         """Close the HTTP client."""
@@ -1,6 +1,10 @@
 """Ingestion service for PDF, URL, and YAML documents."""
 
-import re
+import asyncio
+import multiprocessing
+from collections import deque
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urljoin, urlparse
@@ -9,13 +13,155 @@ import httpx
 import pdfplumber
 import yaml
 from bs4 import BeautifulSoup
-from sqlalchemy import select
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Capability, Facility, Lab, SourceChunk, SourceDocument
-from app.models.schemas import SourceTypeEnum
+from app.models.database import uuid7
+from app.models.source import SourceType
+from app.services.cache import sources_cache
 from app.services.embeddings import get_embedding_service
 
+try:
+    # PyMuPDF's C parser, when installed (the fast-pdf extra)
+    import fitz
+except ImportError:
+    fitz = None
+
+try:
+    # selectolax's C HTML parser, when installed (the fast-html extra)
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# Page elements dropped before extracting a web page's text
+HTML_SKIP_TAGS = ["script", "style", "nav", "footer", "header"]
+
+# libyaml's C loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Chunk windows are cut back to a sentence end when one falls within this many
+# words of the window's end
+CHUNK_SENTENCE_SNAP_WORDS = 20
+SENTENCE_ENDINGS = (".", "!", "?")
+
+# PDF pages extracted per task. The first batch is read in a thread; longer
+# PDFs extract the remaining batches in parallel worker processes, since
+# pdfminer's layout analysis is CPU-bound and holds the GIL.
+PDF_PAGE_BATCH_SIZE = 10
+
+# Connection pool for fetching web pages, shared across ingests so repeat
+# hosts reuse kept-alive connections
+URL_FETCH_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+
+# Page batches extracted ahead of the one being chunked, and chunk batches
+# being embedded at once. Each batch's records are written and released as
+# soon as it is embedded, so memory use is bounded by these rather than by
+# the length of the PDF.
+PDF_EXTRACT_BATCHES_AHEAD = 8
+PDF_EMBED_BATCHES_IN_FLIGHT = 4
+
+_pdf_executor: Optional[ProcessPoolExecutor] = None
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """Get the process pool for PDF page extraction, starting it on first use."""
+    global _pdf_executor
+    if _pdf_executor is None:
+        # forkserver: workers are not forked from the threaded server process.
+        # Platforms without it (Windows) use spawn, which is equally safe.
+        start_method = (
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        _pdf_executor = ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context(start_method),
+        )
+    return _pdf_executor
+
+
+def shutdown_pdf_executor() -> None:
+    """Stop the PDF extraction worker processes, if started."""
+    global _pdf_executor
+    if _pdf_executor is not None:
+        _pdf_executor.shutdown(cancel_futures=True)
+        _pdf_executor = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the HTTP client for fetching web pages, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(follow_redirects=True, limits=URL_FETCH_LIMITS)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the web page HTTP client, if created."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _extract_pdf_pages(
+    file_path: str, first_page: int, last_page: int
+) -> tuple[int, list[list[str]]]:
+    """Extract the words of a range of PDF pages.
+
+    Runs in a worker thread or process, so it opens the file itself. Uses
+    PyMuPDF when installed, which is several times faster than pdfplumber's
+    pdfminer backend, and pdfplumber otherwise. Words come segmented by the
+    PDF parser, so chunking needs no second tokenization pass.
+
+    Args:
+        file_path: Path to PDF file
+        first_page: First page number to extract (1-based)
+        last_page: Last page number to extract (inclusive)
+
+    Returns:
+        Tuple of (total page count, words of each extracted page)
+    """
+    if fitz is not None:
+        with fitz.open(file_path) as doc:
+            page_count = doc.page_count
+            # Word tuples are (x0, y0, x1, y1, word, block, line, word_no)
+            return page_count, [
+                [word[4] for word in doc[i].get_text("words")]
+                for i in range(first_page - 1, min(last_page, page_count))
+            ]
+
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+        pages = pdf.pages[first_page - 1:last_page]
+        return page_count, [[word["text"] for word in page.extract_words()] for page in pages]
+
+
+def _extract_html_text(html: str) -> str:
+    """Extract the visible text of a web page.
+
+    Uses selectolax when installed, which parses in C and is many times
+    faster than BeautifulSoup's pure-Python html.parser backend.
+
+    Args:
+        html: Page HTML
+
+    Returns:
+        Text of the page body, whitespace-stripped and space-separated
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        tree.strip_tags(HTML_SKIP_TAGS)
+        node = tree.body or tree.root
+        return node.text(separator=" ", strip=True) if node is not None else ""
+
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(HTML_SKIP_TAGS):
+        element.decompose()
+    return soup.get_text(separator=" ", strip=True)
+
 
 class IngestionService:
     """Service for ingesting documents into the knowledge base."""
@@ -40,61 +186,222 @@ class IngestionService:
         Returns:
             List of chunk dicts with 'text' and 'metadata'
         """
-        # Clean text
-        text = re.sub(r'\s+', ' ', text).strip()
+        return self._chunk_words(text.split(), chunk_size, chunk_overlap)
 
-        # Split into sentences (approximate)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+    def _chunk_words(
+        self,
+        words: list[str],
+        chunk_size: int = 500,
+        chunk_overlap: int = 50,
+    ) -> list[dict]:
+        """Split a list of words into overlapping chunks.
 
-        chunks = []
-        current_chunk = []
-        current_word_count = 0
-
-        for sentence in sentences:
-            words = sentence.split()
-            word_count = len(words)
-
-            if current_word_count + word_count > chunk_size and current_chunk:
-                # Save current chunk
-                chunk_text = ' '.join(current_chunk)
-                chunks.append({
-                    "text": chunk_text,
-                    "metadata": {"word_count": current_word_count},
-                })
-
-                # Start new chunk with overlap
-                overlap_words = chunk_overlap
-                overlap_sentences = []
-                overlap_word_count = 0
-                for s in reversed(current_chunk):
-                    s_words = len(s.split())
-                    if overlap_word_count + s_words <= overlap_words:
-                        overlap_sentences.insert(0, s)
-                        overlap_word_count += s_words
-                    else:
-                        break
+        Chunks are fixed windows over the words, each starting chunk_overlap
+        words before the previous one ended. A chunk that would end
+        mid-sentence is cut back to the last sentence end within its final
+        CHUNK_SENTENCE_SNAP_WORDS words, if there is one.
+
+        Args:
+            words: Words of the text, in order
+            chunk_size: Target chunk size in words
+            chunk_overlap: Number of overlapping words between chunks
 
-                current_chunk = overlap_sentences
-                current_word_count = overlap_word_count
+        Returns:
+            List of chunk dicts with 'text' and 'metadata'
+        """
+        num_words = len(words)
 
-            current_chunk.append(sentence)
-            current_word_count += word_count
+        chunks = []
+        start = 0
+        while start < num_words:
+            end = min(start + chunk_size, num_words)
+            if end < num_words:
+                for boundary in range(end, max(start, end - CHUNK_SENTENCE_SNAP_WORDS), -1):
+                    if words[boundary - 1].endswith(SENTENCE_ENDINGS):
+                        end = boundary
+                        break
 
-        # Add final chunk
-        if current_chunk:
-            chunk_text = ' '.join(current_chunk)
             chunks.append({
-                "text": chunk_text,
-                "metadata": {"word_count": current_word_count},
+                "text": ' '.join(words[start:end]),
+                "metadata": {"word_count": end - start},
             })
+            if end == num_words:
+                break
+            start = max(end - chunk_overlap, start + 1)
 
         return chunks
 
+    async def _add_chunks(self, source_document_id: str, chunks: list[dict]) -> None:
+        """Embed chunks into the vector store and add their records.
+
+        The records are added to the session in one batch and flushed while
+        the chunks are embedded; callers commit once the whole document is in.
+
+        Args:
+            source_document_id: ID of the chunks' source document
+            chunks: Chunk dicts with 'text' and 'metadata', in document order
+        """
+        chunk_ids = self.embedding_service.prepare_chunks(chunks, source_document_id)
+        self._add_chunk_records(source_document_id, chunks, chunk_ids)
+        # Both are awaited to the end even if one fails, so that no flush is
+        # left running on the session when the error reaches the caller
+        results = await asyncio.gather(
+            self.embedding_service.add_chunks(
+                chunks=chunks,
+                source_document_id=source_document_id,
+                ids=chunk_ids,
+            ),
+            self.db.flush(),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def _add_chunk_records(
+        self, source_document_id: str, chunks: list[dict], chunk_ids: list[str]
+    ) -> list[SourceChunk]:
+        """Add the records of chunks already in the vector store, in one batch.
+
+        Args:
+            source_document_id: ID of the chunks' source document
+            chunks: Chunk dicts with 'text' and 'metadata', prepared by the
+                embedding service's prepare_chunks()
+            chunk_ids: Vector store IDs of the chunks
+
+        Returns:
+            The added records
+        """
+        records = [
+            SourceChunk(
+                id=chunk_id,
+                source_document_id=source_document_id,
+                text=chunk_data["text"],
+                metadata_=chunk_data["metadata"],
+                chunk_index=chunk_data["metadata"]["chunk_index"],
+            )
+            for chunk_id, chunk_data in zip(chunk_ids, chunks)
+        ]
+        self.db.add_all(records)
+        return records
+
+    async def _store_embedded_batch(
+        self,
+        source_document_id: str,
+        embedding: asyncio.Task,
+        chunks: list[dict],
+        chunk_ids: list[str],
+    ) -> None:
+        """Write the records of a batch of chunks once it is embedded.
+
+        The records are flushed and then expunged, so the session does not
+        hold every chunk of the document until commit.
+
+        Args:
+            source_document_id: ID of the chunks' source document
+            embedding: Task adding the chunks to the vector store
+            chunks: The batch's chunk dicts, prepared by prepare_chunks()
+            chunk_ids: The batch's chunk IDs
+        """
+        await embedding
+        records = self._add_chunk_records(source_document_id, chunks, chunk_ids)
+        await self.db.flush()
+        for record in records:
+            self.db.expunge(record)
+
+    async def _delete_documents_at(
+        self, url_or_path: str, keep_id: Optional[str] = None
+    ) -> None:
+        """Delete previously ingested documents at a path or URL, with their chunks.
+
+        Uses two bulk DELETEs rather than loading each document and its
+        chunks to delete them one by one through the ORM cascade.
+
+        Args:
+            url_or_path: Path or URL the documents were ingested from
+            keep_id: ID of a document at the same location to keep, e.g.
+                the one replacing them
+        """
+        documents = SourceDocument.url_or_path == url_or_path
+        if keep_id is not None:
+            documents &= SourceDocument.id != keep_id
+        await self.db.execute(
+            delete(SourceChunk)
+            .where(SourceChunk.source_document_id.in_(select(SourceDocument.id).where(documents)))
+            # Chunk records are not kept in the session, so no sync is needed
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(
+            delete(SourceDocument).where(documents).returning(SourceDocument.id)
+        )
+        deleted_ids = result.scalars().all()
+        if deleted_ids:
+            # Bulk DELETE bypasses the mapper events that invalidate the cache
+            sources_cache.invalidate_after_commit(self.db)
+            await asyncio.gather(*(
+                self.embedding_service.delete_document_chunks(doc_id) for doc_id in deleted_ids
+            ))
+
+    async def _iter_pdf_pages(self, file_path: Path) -> AsyncIterator[list[dict]]:
+        """Extract the words of a PDF's pages without blocking the event loop.
+
+        Pages are yielded in order, a batch at a time, as soon as each batch
+        is extracted, so callers can process early pages while later ones
+        are still being extracted.
+
+        Args:
+            file_path: Path to PDF file
+
+        Yields:
+            Lists of dicts with 'page' (1-based) and 'words'
+        """
+        path = str(file_path)
+        page_count, pages = await asyncio.to_thread(
+            _extract_pdf_pages, path, 1, PDF_PAGE_BATCH_SIZE
+        )
+
+        # Keep up to PDF_EXTRACT_BATCHES_AHEAD batches extracting in worker
+        # processes, starting them before handing out the first batch
+        loop = asyncio.get_running_loop()
+        first_pages = iter(range(PDF_PAGE_BATCH_SIZE + 1, page_count + 1, PDF_PAGE_BATCH_SIZE))
+        batches: deque[tuple[int, asyncio.Future]] = deque()
+
+        def extract_next_batch() -> None:
+            first_page = next(first_pages, None)
+            if first_page is not None:
+                batches.append((
+                    first_page,
+                    loop.run_in_executor(
+                        _get_pdf_executor(),
+                        _extract_pdf_pages,
+                        path,
+                        first_page,
+                        first_page + PDF_PAGE_BATCH_SIZE - 1,
+                    ),
+                ))
+
+        for _ in range(PDF_EXTRACT_BATCHES_AHEAD):
+            extract_next_batch()
+
+        try:
+            yield [{"page": i + 1, "words": words} for i, words in enumerate(pages)]
+            while batches:
+                first_page, batch = batches.popleft()
+                extract_next_batch()
+                _, pages = await batch
+                yield [
+                    {"page": first_page + i, "words": words} for i, words in enumerate(pages)
+                ]
+        finally:
+            for _, batch in batches:
+                batch.cancel()
+
     async def ingest_pdf(
         self,
         file_path: Path,
         title: str,
         metadata: Optional[dict] = None,
+        content_hash: Optional[str] = None,
     ) -> tuple[SourceDocument, int]:
         """Ingest a PDF document.
 
@@ -102,20 +409,13 @@ class IngestionService:
             file_path: Path to PDF file
             title: Document title
             metadata: Optional metadata dict
+            content_hash: Optional SHA-256 of the file. When it matches the
+                hash stored for the same path, extraction and embedding are
+                skipped and the existing document is returned.
 
         Returns:
             Tuple of (SourceDocument, num_chunks)
         """
-        # Extract text from PDF
-        text_by_page = []
-        with pdfplumber.open(file_path) as pdf:
-            for i, page in enumerate(pdf.pages):
-                page_text = page.extract_text() or ""
-                text_by_page.append({
-                    "page": i + 1,
-                    "text": page_text,
-                })
-
         # Check if source document with same path already exists
         result = await self.db.execute(
             select(SourceDocument).where(
@@ -124,49 +424,94 @@ class IngestionService:
         )
         existing_doc = result.scalar_one_or_none()
 
-        if existing_doc:
-            # Delete old chunks from ChromaDB
-            await self.embedding_service.delete_document_chunks(existing_doc.id)
-            # Delete old source document
-            await self.db.delete(existing_doc)
-            await self.db.flush()
+        if content_hash:
+            metadata = {**(metadata or {}), "content_hash": content_hash}
+            if existing_doc and (existing_doc.metadata_ or {}).get("content_hash") == content_hash:
+                # Unchanged file: keep the existing chunks and embeddings
+                existing_doc.title = title
+                existing_doc.metadata_ = metadata
+                num_chunks = await self.db.scalar(
+                    select(func.count())
+                    .select_from(SourceChunk)
+                    .where(SourceChunk.source_document_id == existing_doc.id)
+                )
+                await self.db.commit()
+                return existing_doc, num_chunks
 
-        # Create source document
+        # The new document replaces any existing one once all its pages are in
         source_doc = SourceDocument(
-            type=SourceTypeEnum.PDF.value,
+            id=uuid7(),
+            type=SourceType.PDF,
             title=title,
             url_or_path=str(file_path),
             metadata_=metadata or {},
         )
         self.db.add(source_doc)
-        await self.db.flush()
 
-        # Create chunks with page metadata
-        all_chunks = []
-        for page_data in text_by_page:
-            page_chunks = self._chunk_text(page_data["text"])
-            for chunk in page_chunks:
-                chunk["metadata"]["page"] = page_data["page"]
-            all_chunks.extend(page_chunks)
+        # Extract, chunk, and embed pages in a pipeline: each batch of pages
+        # is embedded while later batches are still being extracted, and its
+        # records are written once embedded. Pages without a text layer
+        # (blank or scanned) are skipped, and recorded for a later OCR pass.
+        num_chunks = 0
+        skipped_pages = []
+        embedding: deque[tuple[asyncio.Task, list[dict], list[str]]] = deque()
+        try:
+            async for batch in self._iter_pdf_pages(file_path):
+                batch_chunks = []
+                for page_data in batch:
+                    if not page_data["words"]:
+                        skipped_pages.append(page_data["page"])
+                        continue
+                    page_chunks = self._chunk_words(page_data["words"])
+                    for chunk in page_chunks:
+                        chunk["metadata"]["page"] = page_data["page"]
+                    batch_chunks.extend(page_chunks)
+                if batch_chunks:
+                    chunk_ids = self.embedding_service.prepare_chunks(
+                        batch_chunks, source_doc.id, start_index=num_chunks
+                    )
+                    embedding.append((
+                        asyncio.create_task(self.embedding_service.add_chunks(
+                            chunks=batch_chunks,
+                            source_document_id=source_doc.id,
+                            ids=chunk_ids,
+                        )),
+                        batch_chunks,
+                        chunk_ids,
+                    ))
+                    num_chunks += len(batch_chunks)
+                    if len(embedding) >= PDF_EMBED_BATCHES_IN_FLIGHT:
+                        await self._store_embedded_batch(source_doc.id, *embedding.popleft())
+            while embedding:
+                await self._store_embedded_batch(source_doc.id, *embedding.popleft())
+        except Exception:
+            # Remove anything already embedded for the document being dropped
+            for task, _, _ in embedding:
+                task.cancel()
+            await asyncio.gather(*(task for task, _, _ in embedding), return_exceptions=True)
+            await self.embedding_service.delete_document_chunks(source_doc.id)
+            raise
+
+        if skipped_pages:
+            source_doc.metadata_ = {**source_doc.metadata_, "skipped_pages": skipped_pages}
+        if existing_doc:
+            await self._delete_documents_at(str(file_path), keep_id=source_doc.id)
 
-        # Create chunk records and embeddings
-        chunk_ids = await self.embedding_service.add_chunks(
-            chunks=all_chunks,
-            source_document_id=source_doc.id,
-        )
+        await self.db.commit()
+        return source_doc, num_chunks
 
-        for i, chunk_data in enumerate(all_chunks):
-            chunk = SourceChunk(
-                id=chunk_ids[i],
-                source_document_id=source_doc.id,
-                text=chunk_data["text"],
-                metadata_=chunk_data["metadata"],
-                chunk_index=i,
-            )
-            self.db.add(chunk)
+    async def _fetch_html(self, url: str) -> str:
+        """Fetch a web page's HTML over the shared HTTP client.
 
-        await self.db.commit()
-        return source_doc, len(all_chunks)
+        Args:
+            url: URL to fetch
+
+        Returns:
+            Response body text
+        """
+        response = await _get_http_client().get(url)
+        response.raise_for_status()
+        return response.text
 
     async def ingest_url(
         self,
@@ -184,46 +529,68 @@ class IngestionService:
         Returns:
             Tuple of (SourceDocument, num_chunks)
         """
-        # Fetch page
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, follow_redirects=True)
-            response.raise_for_status()
-            html = response.text
+        html = await self._fetch_html(url)
+        return await self._ingest_html(url, title, html, metadata)
 
-        # Parse HTML
-        soup = BeautifulSoup(html, 'html.parser')
+    async def ingest_urls(
+        self,
+        urls: list[str],
+        titles: Optional[list[str]] = None,
+        metadata: Optional[dict] = None,
+    ) -> list[tuple[SourceDocument, int]]:
+        """Ingest several web pages, fetching them concurrently.
 
-        # Remove script and style elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'header']):
-            element.decompose()
+        Pages are stored one at a time once all fetches succeed, since they
+        share this service's database session.
 
-        # Extract text
-        text = soup.get_text(separator=' ', strip=True)
+        Args:
+            urls: URLs to scrape
+            titles: Document title for each URL (defaults to the URL)
+            metadata: Optional metadata dict applied to every document
 
-        # Check if source document with same URL already exists
-        result = await self.db.execute(
-            select(SourceDocument).where(
-                SourceDocument.url_or_path == url
-            )
-        )
-        existing_doc = result.scalar_one_or_none()
+        Returns:
+            List of (SourceDocument, num_chunks), in URL order
+        """
+        if titles is None:
+            titles = urls
+        pages = await asyncio.gather(*(self._fetch_html(url) for url in urls))
+        return [
+            await self._ingest_html(url, title, html, metadata)
+            for url, title, html in zip(urls, titles, pages)
+        ]
+
+    async def _ingest_html(
+        self,
+        url: str,
+        title: str,
+        html: str,
+        metadata: Optional[dict] = None,
+    ) -> tuple[SourceDocument, int]:
+        """Extract, chunk, and store the text of a fetched web page.
 
-        if existing_doc:
-            # Delete old chunks from ChromaDB
-            await self.embedding_service.delete_document_chunks(existing_doc.id)
-            # Delete old source document
-            await self.db.delete(existing_doc)
-            await self.db.flush()
+        Args:
+            url: URL the page was fetched from
+            title: Document title
+            html: Page HTML
+            metadata: Optional metadata dict
+
+        Returns:
+            Tuple of (SourceDocument, num_chunks)
+        """
+        text = _extract_html_text(html)
+
+        # Replace any previous ingest of the same URL
+        await self._delete_documents_at(url)
 
         # Create source document
         source_doc = SourceDocument(
-            type=SourceTypeEnum.HTML.value,
+            id=uuid7(),
+            type=SourceType.HTML,
             title=title,
             url_or_path=url,
             metadata_=metadata or {},
         )
         self.db.add(source_doc)
-        await self.db.flush()
 
         # Create chunks
         chunks = self._chunk_text(text)
@@ -231,20 +598,7 @@ class IngestionService:
             chunk["metadata"]["url"] = url
 
         # Create chunk records and embeddings
-        chunk_ids = await self.embedding_service.add_chunks(
-            chunks=chunks,
-            source_document_id=source_doc.id,
-        )
-
-        for i, chunk_data in enumerate(chunks):
-            chunk = SourceChunk(
-                id=chunk_ids[i],
-                source_document_id=source_doc.id,
-                text=chunk_data["text"],
-                metadata_=chunk_data["metadata"],
-                chunk_index=i,
-            )
-            self.db.add(chunk)
+        await self._add_chunks(source_doc.id, chunks)
 
         await self.db.commit()
         return source_doc, len(chunks)
@@ -252,6 +606,7 @@ class IngestionService:
     async def ingest_yaml_capabilities(
         self,
         file_path: Path,
+        content: bytes | str | None = None,
     ) -> tuple[int, int, int]:
         """Ingest capabilities from a YAML file.
 
@@ -267,53 +622,57 @@ class IngestionService:
                     modalities: [...]
                     ...
 
+        Args:
+            file_path: YAML file path; also identifies the source document
+                for re-imports
+            content: YAML content already in memory (e.g. an upload). When
+                given, file_path is not read.
+
         Returns:
             Tuple of (labs_created, facilities_created, capabilities_created)
         """
-        with open(file_path) as f:
-            data = yaml.safe_load(f)
+        if content is None:
+            with open(file_path, "rb") as f:
+                content = f.read()
+        data = yaml.load(content, Loader=YAML_LOADER)
 
         labs_created = 0
         facilities_created = 0
         capabilities_created = 0
-        chunk_counter = 0  # Track chunk index across all capabilities
+        # One search chunk per capability, embedded together at the end
+        capability_chunks: list[dict] = []
 
-        # Check if source document with same path already exists
-        result = await self.db.execute(
-            select(SourceDocument).where(
-                SourceDocument.url_or_path == str(file_path)
-            )
-        )
-        existing_doc = result.scalar_one_or_none()
-
-        if existing_doc:
-            # Delete old chunks from ChromaDB
-            await self.embedding_service.delete_document_chunks(existing_doc.id)
-            # Delete old source document (will cascade to capabilities via foreign key)
-            await self.db.delete(existing_doc)
-            await self.db.flush()
+        # Replace any previous import of the same file
+        await self._delete_documents_at(str(file_path))
 
         # Create source document for provenance
         source_doc = SourceDocument(
-            type=SourceTypeEnum.YAML.value,
+            id=uuid7(),
+            type=SourceType.YAML,
             title=f"Capability Import: {file_path.name}",
             url_or_path=str(file_path),
         )
         self.db.add(source_doc)
-        await self.db.flush()
+
+        # Existing labs and facilities, fetched up front rather than looked up
+        # one query per YAML entry. IDs of new rows are assigned here so
+        # children can reference them without flushing.
+        labs_by_key = {
+            (lab.name, lab.institution): lab
+            for lab in (await self.db.execute(select(Lab))).scalars()
+        }
+        facilities_by_key = {
+            (facility.lab_id, facility.name): facility
+            for facility in (await self.db.execute(select(Facility))).scalars()
+        }
 
         for lab_data in data.get("labs", []):
-            # Check if lab exists
-            result = await self.db.execute(
-                select(Lab).where(
-                    Lab.name == lab_data["name"],
-                    Lab.institution == lab_data.get("institution", ""),
-                )
-            )
-            lab = result.scalar_one_or_none()
+            lab_key = (lab_data["name"], lab_data.get("institution", ""))
+            lab = labs_by_key.get(lab_key)
 
             if not lab:
                 lab = Lab(
+                    id=uuid7(),
                     name=lab_data["name"],
                     institution=lab_data.get("institution", ""),
                     location=lab_data.get("location"),
@@ -322,27 +681,22 @@ class IngestionService:
                     description=lab_data.get("description"),
                 )
                 self.db.add(lab)
-                await self.db.flush()
+                labs_by_key[lab_key] = lab
                 labs_created += 1
 
             for facility_data in lab_data.get("facilities", []):
-                # Check if facility exists
-                result = await self.db.execute(
-                    select(Facility).where(
-                        Facility.lab_id == lab.id,
-                        Facility.name == facility_data["name"],
-                    )
-                )
-                facility = result.scalar_one_or_none()
+                facility_key = (lab.id, facility_data["name"])
+                facility = facilities_by_key.get(facility_key)
 
                 if not facility:
                     facility = Facility(
+                        id=uuid7(),
                         lab_id=lab.id,
                         name=facility_data["name"],
                         description=facility_data.get("description"),
                     )
                     self.db.add(facility)
-                    await self.db.flush()
+                    facilities_by_key[facility_key] = facility
                     facilities_created += 1
 
                 for cap_data in facility_data.get("capabilities", []):
@@ -363,35 +717,24 @@ class IngestionService:
                     capabilities_created += 1
 
                     # Also create a chunk for this capability for search
-                    cap_text = f"{cap_data['name']}: {cap_data.get('description', '')}"
+                    cap_parts = [f"{cap_data['name']}: {cap_data.get('description', '')}"]
                     if cap_data.get("modalities"):
-                        cap_text += f" Modalities: {', '.join(cap_data['modalities'])}."
+                        cap_parts.append(f"Modalities: {', '.join(cap_data['modalities'])}.")
                     if cap_data.get("tags"):
-                        cap_text += f" Tags: {', '.join(cap_data['tags'])}."
+                        cap_parts.append(f"Tags: {', '.join(cap_data['tags'])}.")
+                    cap_text = " ".join(cap_parts)
 
                     chunk_metadata = {
                         "type": "capability",
                         "capability_name": cap_data["name"],
                         "facility_name": facility_data["name"],
                         "lab_name": lab_data["name"],
-                        "chunk_index": chunk_counter,
+                        "chunk_index": len(capability_chunks),
                     }
+                    capability_chunks.append({"text": cap_text, "metadata": chunk_metadata})
 
-                    # Add to vector store and get generated IDs
-                    chunk_ids = await self.embedding_service.add_chunks(
-                        chunks=[{"text": cap_text, "metadata": chunk_metadata}],
-                        source_document_id=source_doc.id,
-                    )
-
-                    chunk = SourceChunk(
-                        id=chunk_ids[0],
-                        source_document_id=source_doc.id,
-                        text=cap_text,
-                        metadata_=chunk_metadata,
-                        chunk_index=chunk_counter,
-                    )
-                    self.db.add(chunk)
-                    chunk_counter += 1
+        # Add all capability chunks to the vector store in one batched call
+        await self._add_chunks(source_doc.id, capability_chunks)
 
         await self.db.commit()
         return labs_created, facilities_created, capabilities_created
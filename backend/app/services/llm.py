@@ -1,12 +1,32 @@
 """LLM service using CBORG API with Anthropic SDK."""
 
-import json
+import asyncio
+import logging
+from collections.abc import AsyncIterator
 from typing import Any, Optional
 
-from anthropic import Anthropic
+import orjson
+from anthropic import Anthropic, AsyncAnthropic
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
+# Marks the end of a prompt prefix for Anthropic prompt caching
+EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def cache_block(text: str) -> dict:
+    """Wrap text in a content block that ends a cached prompt prefix.
+
+    Args:
+        text: Static prompt text (e.g. a system prompt)
+
+    Returns:
+        Text content block with cache_control set
+    """
+    return {"type": "text", "text": text, "cache_control": EPHEMERAL_CACHE_CONTROL}
+
 
 class LLMService:
     """Service for LLM interactions via CBORG."""
@@ -14,6 +34,7 @@ class LLMService:
     def __init__(self):
         self.settings = get_settings()
         self._client: Optional[Anthropic] = None
+        self._async_client: Optional[AsyncAnthropic] = None
 
     @property
     def client(self) -> Anthropic:
@@ -25,26 +46,24 @@ class LLMService:
             )
         return self._client
 
-    def generate(
+    @property
+    def async_client(self) -> AsyncAnthropic:
+        """Lazy initialization of the async Anthropic client (used for streaming)."""
+        if self._async_client is None:
+            self._async_client = AsyncAnthropic(
+                api_key=self.settings.anthropic_auth_token,
+                base_url=self.settings.anthropic_base_url,
+            )
+        return self._async_client
+
+    def _request_kwargs(
         self,
         messages: list[dict],
-        system: Optional[str] = None,
-        tools: Optional[list[dict]] = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-    ) -> dict:
-        """Generate a response from the LLM.
-
-        Args:
-            messages: List of message dicts with 'role' and 'content'
-            system: Optional system prompt
-            tools: Optional list of tool definitions for function calling
-            max_tokens: Maximum tokens in response
-            temperature: Sampling temperature
-
-        Returns:
-            Response dict with 'content', 'tool_calls', and 'usage'
-        """
+        system: Optional[str | list[dict]],
+        tools: Optional[list[dict]],
+        max_tokens: int,
+    ) -> dict[str, Any]:
+        """Build the keyword arguments for a Messages API request."""
         kwargs: dict[str, Any] = {
             "model": self.settings.llm_model,
             "messages": messages,
@@ -57,35 +76,135 @@ class LLMService:
         if tools:
             kwargs["tools"] = tools
 
-        response = self.client.messages.create(**kwargs)
-
-        result = {
-            "content": "",
-            "tool_calls": [],
-            "usage": {
-                "input_tokens": response.usage.input_tokens,
-                "output_tokens": response.usage.output_tokens,
-            },
-            "stop_reason": response.stop_reason,
-        }
+        return kwargs
 
+    @staticmethod
+    def _parse_response(response: Any) -> dict:
+        """Convert an Anthropic message into the service's response dict."""
+        text_parts = []
+        tool_calls = []
         for block in response.content:
             if block.type == "text":
-                result["content"] += block.text
+                text_parts.append(block.text)
             elif block.type == "tool_use":
-                result["tool_calls"].append({
+                tool_calls.append({
                     "id": block.id,
                     "name": block.name,
                     "input": block.input,
                 })
 
-        return result
+        return {
+            "content": "".join(text_parts),
+            "tool_calls": tool_calls,
+            "usage": {
+                "input_tokens": response.usage.input_tokens,
+                "output_tokens": response.usage.output_tokens,
+                # Prompt caching: tokens written to and read from the cache
+                "cache_creation_input_tokens": response.usage.cache_creation_input_tokens or 0,
+                "cache_read_input_tokens": response.usage.cache_read_input_tokens or 0,
+            },
+            "stop_reason": response.stop_reason,
+        }
+
+    def generate(
+        self,
+        messages: list[dict],
+        system: Optional[str | list[dict]] = None,
+        tools: Optional[list[dict]] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> dict:
+        """Generate a response from the LLM.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            system: Optional system prompt, as a string or content blocks
+                (use cache_block() to make it a cached prefix)
+            tools: Optional list of tool definitions for function calling
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+
+        Returns:
+            Response dict with 'content', 'tool_calls', and 'usage'
+        """
+        response = self.client.messages.create(
+            **self._request_kwargs(messages, system, tools, max_tokens)
+        )
+        return self._parse_response(response)
+
+    async def _run_tool_calls(
+        self,
+        response: dict,
+        current_messages: list[dict],
+        all_tool_results: list[dict],
+        tool_executor: Optional[callable],
+    ) -> None:
+        """Execute a response's tool calls and append the exchange to the messages.
+
+        Args:
+            response: Response dict containing tool_calls
+            current_messages: Messages of the tool use loop, extended in place
+            all_tool_results: Executed tool records, extended in place
+            tool_executor: Async function to execute tools (name, input) -> result
+        """
+        # Add assistant message with tool calls
+        assistant_content = []
+        if response["content"]:
+            assistant_content.append({
+                "type": "text",
+                "text": response["content"],
+            })
+        for tool_call in response["tool_calls"]:
+            assistant_content.append({
+                "type": "tool_use",
+                "id": tool_call["id"],
+                "name": tool_call["name"],
+                "input": tool_call["input"],
+            })
+
+        current_messages.append({
+            "role": "assistant",
+            "content": assistant_content,
+        })
+
+        async def execute(tool_call: dict) -> Any:
+            if not tool_executor:
+                return {"error": "No tool executor provided"}
+            try:
+                return await tool_executor(tool_call["name"], tool_call["input"])
+            except Exception as e:
+                logger.error(
+                    "Tool execution error for %s: %s", tool_call["name"], e, exc_info=True
+                )
+                return {"error": str(e)}
+
+        # The calls of one response are independent, so run them concurrently
+        results = await asyncio.gather(*(execute(tc) for tc in response["tool_calls"]))
+
+        # Add results, in call order
+        tool_results = []
+        for tool_call, result in zip(response["tool_calls"], results):
+            tool_results.append({
+                "type": "tool_result",
+                "tool_use_id": tool_call["id"],
+                "content": orjson.dumps(result).decode() if isinstance(result, dict) else str(result),
+            })
+            all_tool_results.append({
+                "tool_name": tool_call["name"],
+                "tool_input": tool_call["input"],
+                "tool_result": result,
+            })
+
+        current_messages.append({
+            "role": "user",
+            "content": tool_results,
+        })
 
     async def generate_with_tools(
         self,
         messages: list[dict],
         tools: list[dict],
-        system: Optional[str] = None,
+        system: Optional[str | list[dict]] = None,
         max_iterations: int = 10,
         tool_executor: Optional[callable] = None,
     ) -> dict:
@@ -94,21 +213,18 @@ class LLMService:
         Args:
             messages: Initial messages
             tools: Tool definitions
-            system: System prompt
+            system: System prompt, as a string or content blocks
             max_iterations: Max tool call iterations
             tool_executor: Async function to execute tools (name, input) -> result
 
         Returns:
             Final response after tool use loop
         """
-        import logging
-        logger = logging.getLogger(__name__)
-
         current_messages = list(messages)
         all_tool_results = []
 
         for _ in range(max_iterations):
-            response = self.generate(
+            response = await self.agenerate(
                 messages=current_messages,
                 system=system,
                 tools=tools,
@@ -118,75 +234,99 @@ class LLMService:
                 response["all_tool_results"] = all_tool_results
                 return response
 
-            # Add assistant message with tool calls
-            assistant_content = []
-            if response["content"]:
-                assistant_content.append({
-                    "type": "text",
-                    "text": response["content"],
-                })
-            for tool_call in response["tool_calls"]:
-                assistant_content.append({
-                    "type": "tool_use",
-                    "id": tool_call["id"],
-                    "name": tool_call["name"],
-                    "input": tool_call["input"],
-                })
+            await self._run_tool_calls(
+                response, current_messages, all_tool_results, tool_executor
+            )
 
-            current_messages.append({
-                "role": "assistant",
-                "content": assistant_content,
-            })
+        # Max iterations reached
+        response["all_tool_results"] = all_tool_results
+        return response
 
-            # Execute tools and add results
-            tool_results = []
-            for tool_call in response["tool_calls"]:
-                if tool_executor:
-                    try:
-                        result = await tool_executor(tool_call["name"], tool_call["input"])
-                    except Exception as e:
-                        logger.error(f"Tool execution error for {tool_call['name']}: {e}", exc_info=True)
-                        result = {"error": str(e)}
-                else:
-                    result = {"error": "No tool executor provided"}
-
-                tool_results.append({
-                    "type": "tool_result",
-                    "tool_use_id": tool_call["id"],
-                    "content": json.dumps(result) if isinstance(result, dict) else str(result),
-                })
-                all_tool_results.append({
-                    "tool_name": tool_call["name"],
-                    "tool_input": tool_call["input"],
-                    "tool_result": result,
-                })
+    async def stream_with_tools(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        system: Optional[str | list[dict]] = None,
+        max_iterations: int = 10,
+        tool_executor: Optional[callable] = None,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[dict]:
+        """Run the tool use loop, streaming text as it is generated.
 
-            current_messages.append({
-                "role": "user",
-                "content": tool_results,
-            })
+        Args:
+            messages: Initial messages
+            tools: Tool definitions
+            system: System prompt, as a string or content blocks
+            max_iterations: Max tool call iterations
+            tool_executor: Async function to execute tools (name, input) -> result
+            max_tokens: Maximum tokens per response
 
-        # Max iterations reached
+        Yields:
+            {"type": "text", "text": ...} for each text delta, then one
+            {"type": "response", "response": ...} with the same final
+            response dict generate_with_tools returns
+        """
+        current_messages = list(messages)
+        all_tool_results = []
+
+        for _ in range(max_iterations):
+            async with self.async_client.messages.stream(
+                **self._request_kwargs(current_messages, system, tools, max_tokens)
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield {"type": "text", "text": text}
+                response = self._parse_response(await stream.get_final_message())
+
+            if not response["tool_calls"]:
+                break
+
+            await self._run_tool_calls(
+                response, current_messages, all_tool_results, tool_executor
+            )
+
+        # Final answer, or max iterations reached
         response["all_tool_results"] = all_tool_results
-        return response
+        yield {"type": "response", "response": response}
+
+    async def astream(
+        self,
+        messages: list[dict],
+        system: Optional[str | list[dict]] = None,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        """Stream the text of a response, without tools, as it is generated.
+
+        Args:
+            messages: List of message dicts with role and content
+            system: System prompt, as a string or content blocks
+            max_tokens: Maximum tokens in response
+
+        Yields:
+            Text deltas
+        """
+        async with self.async_client.messages.stream(
+            **self._request_kwargs(messages, system, None, max_tokens)
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
 
     async def agenerate(
         self,
         messages: list[dict],
-        system: Optional[str] = None,
+        system: Optional[str | list[dict]] = None,
         tools: Optional[list[dict]] = None,
         max_tokens: int = 4096,
         temperature: float = 0.7,
     ) -> dict:
-        """Async version of generate (uses sync client internally)."""
-        # For now, wrap sync call - can be made truly async later
-        return self.generate(
-            messages=messages,
-            system=system,
-            tools=tools,
-            max_tokens=max_tokens,
-            temperature=temperature,
+        """Async version of generate, on the async client.
+
+        Awaiting the request frees the event loop for other requests while
+        the LLM responds. Arguments and return value are as for generate().
+        """
+        response = await self.async_client.messages.create(
+            **self._request_kwargs(messages, system, tools, max_tokens)
         )
+        return self._parse_response(response)
 
 
 # Singleton instance
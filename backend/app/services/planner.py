@@ -1,16 +1,16 @@
 """Planning service for generating OPAL resource deployment plans."""
 
+from collections.abc import AsyncIterator, Iterator
 from typing import Optional
 
+import numpy as np
+import orjson
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.schemas import (
-    Citation,
-    OPALPlan,
-    PlanStep,
-    RiskItem,
-)
-from app.services.llm import get_llm_service
+from app.models.schemas import CapabilitySearchResult, OPALPlan, PlanStep
+from app.services.cache import plan_cache
+from app.services.llm import cache_block, get_llm_service
 from app.services.retrieval import RetrievalService, get_retrieval_service
 
 
@@ -51,6 +51,129 @@ When creating a plan:
 
 Return a complete, well-structured plan that a scientist can immediately begin executing."""
 
+PLAN_FORMAT = """Return the plan as a JSON object with this structure:
+{
+    "goal_summary": "...",
+    "assumptions": ["..."],
+    "steps": [
+        {
+            "step_id": "S1",
+            "objective": "...",
+            "recommended_facility": "Lab Name - Facility Name",
+            "capability_ids": ["..."],
+            "inputs": ["..."],
+            "outputs": ["..."],
+            "constraints": ["..."],
+            "dependencies": [],
+            "decision_points": ["..."],
+            "citations": [{"source_document_id": "...", "quote": "..."}],
+            "is_hypothesis": false
+        }
+    ],
+    "open_questions": ["..."],
+    "risks_and_alternatives": [
+        {"risk": "...", "impact": "...", "alternative": "..."}
+    ]
+}"""
+
+# Per-goal request; the plan format it refers to is in the system prompt
+PLAN_REQUEST_TEMPLATE = """Research Goal: {goal}
+{context}
+{constraints}
+
+Available OPAL Capabilities (from capability registry):
+{capabilities}
+
+Please create a detailed OPAL Resource Deployment Plan as a JSON object in the format given."""
+
+# The instructions and plan format are identical on every call, so they are
+# sent as a cached prompt prefix; only the goal and capabilities vary.
+PLANNER_SYSTEM_BLOCKS = [cache_block(f"{PLANNER_SYSTEM_PROMPT}\n\n{PLAN_FORMAT}")]
+
+# A request with the same context and constraints as a cached plan reuses
+# it when their goals' embeddings are at least this similar (cosine)
+PLAN_CACHE_SIMILARITY = 0.95
+
+# Goal embeddings of the plans in plan_cache, by cache key
+_plan_goal_embeddings: dict[tuple, np.ndarray] = {}
+
+
+class _PlanJSONScanner:
+    """Incremental scanner for the plan JSON in a streamed LLM response.
+
+    Text is fed in as it arrives and each character is scanned once,
+    tracking string/escape state and bracket depth. Each element of the
+    top-level "steps" array is returned as soon as its closing brace is
+    seen, and the span of the whole plan object is recorded when it closes.
+    Text before the first brace (e.g. a preamble) is skipped.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.object_start: Optional[int] = None
+        self.object_end: Optional[int] = None
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key = ""
+        self._in_steps = False
+        self._step_start = 0
+
+    @property
+    def plan_json(self) -> Optional[str]:
+        """JSON text of the complete plan object, once it has closed."""
+        if self.object_end is None:
+            return None
+        return self.buffer[self.object_start:self.object_end]
+
+    def feed(self, text: str) -> Iterator[str]:
+        """Add streamed text, yielding the JSON of each step it completes."""
+        self.buffer += text
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            if self.object_end is not None:
+                break
+            char = buffer[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        # At the top level, the last string before "[" is its key
+                        self._last_key = buffer[self._string_start:i + 1]
+                continue
+
+            if self.object_start is None:
+                if char == "{":
+                    self.object_start = i
+                    self._depth = 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._last_key == '"steps"':
+                    self._in_steps = True
+                elif char == "{" and self._depth == 3 and self._in_steps:
+                    self._step_start = i
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 2 and self._in_steps and char == "}":
+                    yield buffer[self._step_start:i + 1]
+                elif self._depth == 1:
+                    self._in_steps = False
+                elif self._depth == 0:
+                    self.object_end = i + 1
+        self._pos = len(buffer)
+
 
 class PlannerService:
     """Service for generating detailed research plans."""
@@ -76,30 +199,118 @@ class PlannerService:
         Returns:
             Complete OPALPlan
         """
+        async for item in self.stream_plan(goal, context, constraints):
+            plan = item
+        return plan
+
+    async def stream_plan(
+        self,
+        goal: str,
+        context: Optional[dict] = None,
+        constraints: Optional[list[str]] = None,
+    ) -> AsyncIterator[PlanStep | OPALPlan]:
+        """Generate a research plan, yielding its steps as they are written.
+
+        The LLM response is streamed and scanned incrementally, so each step
+        is available as soon as its JSON object closes rather than after the
+        whole plan has been generated. Plans are cached for repeated or
+        near-identical requests (see PLAN_CACHE_SIMILARITY) until the
+        capability registry changes.
+
+        Args:
+            goal: Research goal description
+            context: Optional context (organism, plant system, etc.)
+            constraints: Optional list of constraints
+
+        Yields:
+            Each PlanStep as it completes, then the complete OPALPlan
+        """
+        cache_key = (
+            goal,
+            orjson.dumps(context, option=orjson.OPT_SORT_KEYS),
+            tuple(constraints or ()),
+        )
+        version = plan_cache.version
+        cached = await self._get_cached_plan(cache_key)
+        if cached is not None:
+            for step in cached.steps:
+                yield step
+            yield cached
+            return
+
+        messages = await self._build_messages(goal, context, constraints)
+
+        scanner = _PlanJSONScanner()
+        async for text in self.llm_service.astream(
+            messages=messages,
+            system=PLANNER_SYSTEM_BLOCKS,
+            max_tokens=4096,
+        ):
+            for step_json in scanner.feed(text):
+                try:
+                    step = PlanStep.model_validate(orjson.loads(step_json))
+                except (orjson.JSONDecodeError, ValidationError):
+                    # Left for the full parse to report
+                    continue
+                yield step
+
+        plan = self._parse_plan(scanner.plan_json)
+        if plan.steps:
+            plan_cache.set(cache_key, plan, version)
+            if len(_plan_goal_embeddings) >= plan_cache.max_entries:
+                _plan_goal_embeddings.clear()
+            _plan_goal_embeddings[cache_key] = await self._goal_embedding(goal)
+        yield plan
+
+    async def _goal_embedding(self, goal: str) -> np.ndarray:
+        """Embed a goal, sharing the capability search's cached embedding."""
+        return await self.retrieval_service.embedding_service.generate_embedding(goal)
+
+    async def _get_cached_plan(self, cache_key: tuple) -> Optional[OPALPlan]:
+        """Find a cached plan for the same request, or for a similar goal.
+
+        Args:
+            cache_key: (goal, context JSON, constraints) of the request
+
+        Returns:
+            The cached plan, or None
+        """
+        plan = plan_cache.get(cache_key)
+        if plan is not None or not _plan_goal_embeddings:
+            return plan
+
+        goal_embedding = await self._goal_embedding(cache_key[0])
+        goal_norm = np.linalg.norm(goal_embedding)
+        best_similarity = PLAN_CACHE_SIMILARITY
+        for key, embedding in list(_plan_goal_embeddings.items()):
+            if key[1:] != cache_key[1:]:
+                continue
+            similarity = float(goal_embedding @ embedding) / (
+                goal_norm * np.linalg.norm(embedding) or 1.0
+            )
+            if similarity < best_similarity:
+                continue
+            candidate = plan_cache.get(key)
+            if candidate is None:
+                # Expired or invalidated
+                del _plan_goal_embeddings[key]
+                continue
+            plan, best_similarity = candidate, similarity
+        return plan
+
+    async def _build_messages(
+        self,
+        goal: str,
+        context: Optional[dict],
+        constraints: Optional[list[str]],
+    ) -> list[dict]:
+        """Build the planning request for a goal, with matching capabilities."""
         # Search for relevant capabilities
         capabilities = await self.retrieval_service.search_capabilities(
             query=goal,
             top_k=20,
         )
 
-        # Build context for the LLM
-        capability_context = []
-        for cap in capabilities:
-            cap_info = {
-                "name": cap.capability.name,
-                "facility": cap.capability.facility_name,
-                "lab": f"{cap.capability.lab_name} ({cap.capability.lab_institution})",
-                "description": cap.capability.description,
-                "modalities": cap.capability.modalities,
-                "throughput": cap.capability.throughput,
-                "constraints": cap.capability.constraints,
-                "source_citations": [
-                    {"source_id": c.source_document_id, "quote": c.text}
-                    for c in cap.source_chunks[:2]
-                ],
-            }
-            capability_context.append(cap_info)
-
         # Build the prompt
         context_str = ""
         if context:
@@ -109,47 +320,14 @@ class PlannerService:
         if constraints:
             constraints_str = f"\n\nConstraints:\n" + "\n".join(f"- {c}" for c in constraints)
 
-        user_message = f"""Research Goal: {goal}
-{context_str}
-{constraints_str}
-
-Available OPAL Capabilities (from capability registry):
-{self._format_capabilities(capability_context)}
-
-Please create a detailed OPAL Resource Deployment Plan. Return it as a JSON object with this structure:
-{{
-    "goal_summary": "...",
-    "assumptions": ["..."],
-    "steps": [
-        {{
-            "step_id": "S1",
-            "objective": "...",
-            "recommended_facility": "Lab Name - Facility Name",
-            "capability_ids": ["..."],
-            "inputs": ["..."],
-            "outputs": ["..."],
-            "constraints": ["..."],
-            "dependencies": [],
-            "decision_points": ["..."],
-            "citations": [{{"source_document_id": "...", "quote": "..."}}],
-            "is_hypothesis": false
-        }}
-    ],
-    "open_questions": ["..."],
-    "risks_and_alternatives": [
-        {{"risk": "...", "impact": "...", "alternative": "..."}}
-    ]
-}}"""
-
-        response = self.llm_service.generate(
-            messages=[{"role": "user", "content": user_message}],
-            system=PLANNER_SYSTEM_PROMPT,
-            max_tokens=4096,
+        user_message = PLAN_REQUEST_TEMPLATE.format(
+            goal=goal,
+            context=context_str,
+            constraints=constraints_str,
+            capabilities=self._format_capabilities(capabilities),
         )
 
-        # Parse the response
-        plan = self._parse_plan_from_response(response["content"])
-        return plan
+        return [{"role": "user", "content": user_message}]
 
     def _format_context(self, context: dict) -> str:
         """Format context dict into readable string."""
@@ -158,32 +336,29 @@ Please create a detailed OPAL Resource Deployment Plan. Return it as a JSON obje
             lines.append(f"- {key}: {value}")
         return "\n".join(lines)
 
-    def _format_capabilities(self, capabilities: list[dict]) -> str:
-        """Format capabilities list for the prompt."""
+    def _format_capabilities(self, capabilities: list[CapabilitySearchResult]) -> str:
+        """Format capability search results for the prompt."""
         lines = []
-        for i, cap in enumerate(capabilities, 1):
-            lines.append(f"\n{i}. {cap['name']} ({cap['lab']} - {cap['facility']})")
-            if cap.get("description"):
-                lines.append(f"   Description: {cap['description']}")
-            if cap.get("modalities"):
-                lines.append(f"   Modalities: {', '.join(cap['modalities'])}")
-            if cap.get("throughput"):
-                lines.append(f"   Throughput: {cap['throughput']}")
-            if cap.get("constraints"):
-                lines.append(f"   Constraints: {cap['constraints']}")
-            if cap.get("source_citations"):
-                for cit in cap["source_citations"]:
-                    lines.append(f"   Source: {cit['source_id']}")
+        for i, result in enumerate(capabilities, 1):
+            cap = result.capability
+            lines.append(
+                f"\n{i}. {cap.name} ({cap.lab_name} ({cap.lab_institution}) - {cap.facility_name})"
+            )
+            if cap.description:
+                lines.append(f"   Description: {cap.description}")
+            if cap.modalities:
+                lines.append(f"   Modalities: {', '.join(cap.modalities)}")
+            if cap.throughput:
+                lines.append(f"   Throughput: {cap.throughput}")
+            if cap.constraints:
+                lines.append(f"   Constraints: {cap.constraints}")
+            for chunk in result.source_chunks[:2]:
+                lines.append(f"   Source: {chunk.source_document_id}")
         return "\n".join(lines)
 
-    def _parse_plan_from_response(self, response: str) -> OPALPlan:
-        """Parse plan JSON from LLM response."""
-        import json
-        import re
-
-        # Try to extract JSON from response
-        json_match = re.search(r'\{[\s\S]*\}', response)
-        if not json_match:
+    def _parse_plan(self, plan_json: Optional[str]) -> OPALPlan:
+        """Parse the plan object's JSON text into an OPALPlan."""
+        if plan_json is None:
             # Return empty plan if no JSON found
             return OPALPlan(
                 goal_summary="Failed to parse plan",
@@ -193,9 +368,11 @@ Please create a detailed OPAL Resource Deployment Plan. Return it as a JSON obje
                 risks_and_alternatives=[],
             )
 
+        # Parsed like ChatService._parse_plan: missing keys fall back to
+        # the schema defaults
         try:
-            plan_data = json.loads(json_match.group())
-        except json.JSONDecodeError:
+            return OPALPlan.model_validate(orjson.loads(plan_json))
+        except (orjson.JSONDecodeError, ValidationError):
             return OPALPlan(
                 goal_summary="Failed to parse plan",
                 assumptions=["JSON parsing error"],
@@ -204,46 +381,13 @@ Please create a detailed OPAL Resource Deployment Plan. Return it as a JSON obje
                 risks_and_alternatives=[],
             )
 
-        # Build plan object
-        steps = []
-        for step_data in plan_data.get("steps", []):
-            citations = []
-            for cit in step_data.get("citations", []):
-                citations.append(Citation(
-                    source_document_id=cit.get("source_document_id", ""),
-                    quote=cit.get("quote", ""),
-                ))
-            steps.append(PlanStep(
-                step_id=step_data.get("step_id", ""),
-                objective=step_data.get("objective", ""),
-                recommended_facility=step_data.get("recommended_facility", ""),
-                capability_ids=step_data.get("capability_ids", []),
-                inputs=step_data.get("inputs", []),
-                outputs=step_data.get("outputs", []),
-                constraints=step_data.get("constraints", []),
-                dependencies=step_data.get("dependencies", []),
-                decision_points=step_data.get("decision_points", []),
-                citations=citations,
-                is_hypothesis=step_data.get("is_hypothesis", False),
-            ))
-
-        risks = []
-        for risk_data in plan_data.get("risks_and_alternatives", []):
-            risks.append(RiskItem(
-                risk=risk_data.get("risk", ""),
-                impact=risk_data.get("impact", ""),
-                alternative=risk_data.get("alternative"),
-            ))
-
-        return OPALPlan(
-            goal_summary=plan_data.get("goal_summary", ""),
-            assumptions=plan_data.get("assumptions", []),
-            steps=steps,
-            open_questions=plan_data.get("open_questions", []),
-            risks_and_alternatives=risks,
-        )
-
 
 def get_planner_service(db: AsyncSession) -> PlannerService:
-    """Get a planner service instance."""
-    return PlannerService(db)
+    """Get the planner service bound to a database session.
+
+    Like the retrieval service, the instance is cached on the session.
+    """
+    service = db.info.get("planner_service")
+    if service is None:
+        service = db.info["planner_service"] = PlannerService(db)
+    return service
@@ -1,12 +1,15 @@
 """Retrieval service for searching capabilities and documents."""
 
+import asyncio
+from collections import defaultdict
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager, joinedload
 
 from app.models import Capability, Facility, Lab, SourceChunk, SourceDocument
+from app.models.database import async_session_maker, json_array_matches
 from app.models.schemas import (
     CapabilitySearchResult,
     CapabilityWithContext,
@@ -14,6 +17,10 @@ from app.models.schemas import (
 )
 from app.services.embeddings import get_embedding_service
 
+# Capability hits fetched per requested result when modality or tag
+# filters may drop some of them
+CAPABILITY_FILTER_OVERFETCH = 3
+
 
 class RetrievalService:
     """Service for retrieving and searching capabilities."""
@@ -22,6 +29,34 @@ class RetrievalService:
         self.db = db
         self.embedding_service = get_embedding_service()
 
+    async def _get_source_titles(
+        self,
+        results: list[dict],
+        session: Optional[AsyncSession] = None,
+    ) -> dict[str, str]:
+        """Look up the source document titles of search results in one query.
+
+        Args:
+            results: Vector search results
+            session: Session to query with, if not the service's own
+
+        Returns:
+            Map of source document ID to title
+        """
+        doc_ids = {
+            doc_id
+            for r in results
+            if (doc_id := r["metadata"].get("source_document_id"))
+        }
+        if not doc_ids:
+            return {}
+
+        rows = await (session or self.db).execute(
+            select(SourceDocument.id, SourceDocument.title)
+            .where(SourceDocument.id.in_(doc_ids))
+        )
+        return dict(rows.all())
+
     async def search_chunks(
         self,
         query: str,
@@ -44,20 +79,18 @@ class RetrievalService:
             filters=filters,
         )
 
+        title_by_id = await self._get_source_titles(results)
+
+        # Results come from our own vector store and database, so the
+        # schemas below are built with model_construct (no validation)
         search_results = []
         for r in results:
-            # Get source document title
             doc_id = r["metadata"].get("source_document_id")
-            source_title = "Unknown"
-            if doc_id:
-                doc = await self.db.get(SourceDocument, doc_id)
-                if doc:
-                    source_title = doc.title
 
-            search_results.append(SearchResult(
+            search_results.append(SearchResult.model_construct(
                 chunk_id=r["id"],
                 source_document_id=doc_id or "",
-                source_title=source_title,
+                source_title=title_by_id.get(doc_id, "Unknown"),
                 text=r["text"],
                 score=r["score"],
                 metadata=r["metadata"],
@@ -85,68 +118,90 @@ class RetrievalService:
         Returns:
             List of CapabilitySearchResult objects
         """
-        # Build filters for vector search
-        filters = {}
+        # Build filters for vector search. Only capability chunks are used,
+        # one per capability, so top_k hits give top_k capabilities unless
+        # the modality and tag filters drop some
+        filters = {"type": "capability"}
         if lab_id:
             filters["lab_id"] = lab_id
+        search_top_k = top_k * CAPABILITY_FILTER_OVERFETCH if modality or tags else top_k
 
         # Search chunks
         chunk_results = await self.embedding_service.search(
             query=query,
-            top_k=top_k * 2,  # Get more results for filtering
-            filters=filters if filters else None,
+            top_k=search_top_k,
+            filters=filters,
         )
 
         # Group results by capability
-        capability_scores: dict[str, tuple[float, list[dict]]] = {}
+        capability_scores: dict[str, float] = {}
+        chunks_by_capability: dict[str, list[dict]] = defaultdict(list)
 
         for result in chunk_results:
             cap_name = result["metadata"].get("capability_name")
             if not cap_name:
                 continue
 
-            if cap_name not in capability_scores:
-                capability_scores[cap_name] = (result["score"], [result])
-            else:
-                current_score, chunks = capability_scores[cap_name]
-                capability_scores[cap_name] = (
-                    max(current_score, result["score"]),
-                    chunks + [result],
-                )
+            score = result["score"]
+            if score > capability_scores.get(cap_name, float("-inf")):
+                capability_scores[cap_name] = score
+            chunks_by_capability[cap_name].append(result)
 
-        # Fetch capability details
-        search_results = []
-        for cap_name, (score, chunks) in sorted(
+        top_capabilities = sorted(
             capability_scores.items(),
-            key=lambda x: x[1][0],
+            key=lambda x: x[1],
             reverse=True,
-        )[:top_k]:
-            # Find capability in database (use first() in case of duplicates)
-            result = await self.db.execute(
-                select(Capability)
-                .options(selectinload(Capability.facility).selectinload(Facility.lab))
-                .where(Capability.name == cap_name)
+        )
+        if not top_capabilities:
+            return []
+
+        async def get_titles() -> dict[str, str]:
+            # A session runs one statement at a time, so the title lookup
+            # gets its own to overlap the capability query
+            async with async_session_maker() as session:
+                return await self._get_source_titles(chunk_results, session)
+
+        # Matched capabilities passing the modality and tag filters, which
+        # are applied in SQL so filtered-out rows are never loaded
+        capability_query = (
+            select(Capability)
+            .options(joinedload(Capability.facility).joinedload(Facility.lab))
+            .where(Capability.name.in_([name for name, _ in top_capabilities]))
+        )
+        if modality:
+            capability_query = capability_query.where(
+                json_array_matches(Capability.modalities, [modality])
+            )
+        if tags:
+            capability_query = capability_query.where(
+                json_array_matches(Capability.tags, tags)
             )
-            capability = result.scalars().first()
 
-            if not capability:
-                continue
+        # Source titles for every capability's chunks, and the capabilities
+        # (the first row wins in case of duplicate names)
+        title_by_id, result = await asyncio.gather(
+            get_titles(),
+            self.db.execute(capability_query),
+        )
+        caps_by_name: dict[str, Capability] = {}
+        for capability in result.scalars():
+            caps_by_name.setdefault(capability.name, capability)
 
-            # Apply additional filters
-            if modality and capability.modalities:
-                if modality.lower() not in [m.lower() for m in capability.modalities]:
-                    continue
+        # Fetch capability details
+        search_results = []
+        for cap_name, score in top_capabilities:
+            if len(search_results) == top_k:
+                break
 
-            if tags and capability.tags:
-                cap_tags_lower = [t.lower() for t in capability.tags]
-                if not any(t.lower() in cap_tags_lower for t in tags):
-                    continue
+            capability = caps_by_name.get(cap_name)
+            if not capability:
+                continue
 
-            # Build response
+            # Build response from trusted rows (validation skipped)
             facility = capability.facility
             lab = facility.lab
 
-            cap_with_context = CapabilityWithContext(
+            cap_with_context = CapabilityWithContext.model_construct(
                 id=capability.id,
                 facility_id=capability.facility_id,
                 name=capability.name,
@@ -167,24 +222,19 @@ class RetrievalService:
             )
 
             source_chunks = []
-            for chunk in chunks:
+            for chunk in chunks_by_capability[cap_name]:
                 doc_id = chunk["metadata"].get("source_document_id")
-                source_title = "Unknown"
-                if doc_id:
-                    doc = await self.db.get(SourceDocument, doc_id)
-                    if doc:
-                        source_title = doc.title
 
-                source_chunks.append(SearchResult(
+                source_chunks.append(SearchResult.model_construct(
                     chunk_id=chunk["id"],
                     source_document_id=doc_id or "",
-                    source_title=source_title,
+                    source_title=title_by_id.get(doc_id, "Unknown"),
                     text=chunk["text"],
                     score=chunk["score"],
                     metadata=chunk["metadata"],
                 ))
 
-            search_results.append(CapabilitySearchResult(
+            search_results.append(CapabilitySearchResult.model_construct(
                 capability=cap_with_context,
                 relevance_score=score,
                 source_chunks=source_chunks,
@@ -197,13 +247,30 @@ class RetrievalService:
         result = await self.db.execute(select(Lab))
         return list(result.scalars().all())
 
+    async def find_lab_by_name(self, name: str) -> Optional[Lab]:
+        """Find a lab whose name contains the given text, case-insensitively.
+
+        Args:
+            name: Full or partial lab name
+
+        Returns:
+            A matching lab, or None
+        """
+        result = await self.db.execute(
+            select(Lab)
+            .where(func.lower(Lab.name).contains(name.lower(), autoescape=True))
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
     async def get_lab_capabilities(self, lab_id: str) -> list[Capability]:
         """Get all capabilities for a lab."""
         result = await self.db.execute(
             select(Capability)
             .join(Facility)
             .where(Facility.lab_id == lab_id)
-            .options(selectinload(Capability.facility))
+            # Populate facility from the JOIN above instead of a second query
+            .options(contains_eager(Capability.facility))
         )
         return list(result.scalars().all())
 
@@ -211,7 +278,7 @@ class RetrievalService:
         """Get a capability by ID with full context."""
         result = await self.db.execute(
             select(Capability)
-            .options(selectinload(Capability.facility).selectinload(Facility.lab))
+            .options(joinedload(Capability.facility).joinedload(Facility.lab))
             .where(Capability.id == capability_id)
         )
         return result.scalar_one_or_none()
@@ -219,16 +286,56 @@ class RetrievalService:
     async def get_source_chunks(
         self,
         source_document_id: str,
-    ) -> list[SourceChunk]:
-        """Get all chunks for a source document."""
-        result = await self.db.execute(
-            select(SourceChunk)
+        skip: int = 0,
+        limit: Optional[int] = None,
+        after_index: Optional[int] = None,
+    ) -> list[Row]:
+        """Get chunks for a source document in chunk order.
+
+        Pagination runs in SQL so skipped chunks are never loaded, and the
+        chunk columns are projected as plain rows rather than ORM objects.
+
+        Args:
+            source_document_id: Source document ID
+            skip: Number of chunks to skip
+            limit: Maximum number of chunks, or None for all
+            after_index: Keyset cursor; only chunks with a greater
+                chunk_index are returned (cheaper than a deep offset)
+
+        Returns:
+            List of rows with the SourceChunk columns
+        """
+        query = (
+            select(
+                SourceChunk.id,
+                SourceChunk.source_document_id,
+                SourceChunk.text,
+                SourceChunk.metadata_,
+                SourceChunk.chunk_index,
+                SourceChunk.created_at,
+            )
             .where(SourceChunk.source_document_id == source_document_id)
             .order_by(SourceChunk.chunk_index)
         )
-        return list(result.scalars().all())
+        if after_index is not None:
+            query = query.where(SourceChunk.chunk_index > after_index)
+        if skip:
+            query = query.offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+
+        result = await self.db.execute(query)
+        return list(result.all())
 
 
 def get_retrieval_service(db: AsyncSession) -> RetrievalService:
-    """Get a retrieval service instance."""
-    return RetrievalService(db)
+    """Get the retrieval service bound to a database session.
+
+    The instance is cached on the session, so the router and the planner
+    service handling one request share it. Expensive clients (embeddings,
+    vector store) are process-wide singletons already.
+    """
+    service = db.info.get("retrieval_service")
+    if service is None:
+        service = db.info["retrieval_service"] = RetrievalService(db)
+    return service
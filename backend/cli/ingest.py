@@ -3,15 +3,19 @@
 
 import argparse
 import asyncio
+import os
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# A command runs a single session, so one pooled connection is enough
+os.environ.setdefault("DB_POOL_SIZE", "1")
+
 from app.config import get_settings
-from app.models.database import async_session_maker, init_db
-from app.services.ingestion import get_ingestion_service
+from app.models.database import async_session_maker, engine, init_db
+from app.services.ingestion import close_http_client, get_ingestion_service
 
 
 async def ingest_pdf(args):
@@ -51,6 +55,7 @@ async def ingest_url(args):
         print(f"Successfully ingested '{args.title}' from URL")
         print(f"  Document ID: {source_doc.id}")
         print(f"  Chunks created: {num_chunks}")
+    await close_http_client()
 
     return 0
 
@@ -77,6 +82,14 @@ async def ingest_yaml(args):
     return 0
 
 
+async def run_command(command, args) -> int:
+    """Run a command, then close the database connections it opened."""
+    try:
+        return await command(args)
+    finally:
+        await engine.dispose()
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -120,11 +133,11 @@ Examples:
         return 1
 
     if args.command == "pdf":
-        return asyncio.run(ingest_pdf(args))
+        return asyncio.run(run_command(ingest_pdf, args))
     elif args.command == "url":
-        return asyncio.run(ingest_url(args))
+        return asyncio.run(run_command(ingest_url, args))
     elif args.command == "yaml":
-        return asyncio.run(ingest_yaml(args))
+        return asyncio.run(run_command(ingest_yaml, args))
 
     return 0
 
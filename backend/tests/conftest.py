@@ -0,0 +1,13 @@
+"""Shared test configuration.
+
+The database engine and vector store are configured when app modules are
+imported, so their locations are pointed at a temporary directory before
+any test module imports the app.
+"""
+
+import os
+import tempfile
+
+_data_dir = tempfile.mkdtemp(prefix="opal-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_data_dir}/opal.db"
+os.environ["CHROMA_PERSIST_DIR"] = f"{_data_dir}/chroma"
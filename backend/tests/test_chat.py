@@ -0,0 +1,120 @@
+"""Tests for saving chat turns to stored conversations."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+from app.models import Conversation
+from app.models.database import async_session_maker, engine, init_db
+from app.services import chat as chat_module
+from app.services.chat import ChatService
+
+
+def search_result(*chunk_ids: str) -> dict:
+    """Build a search_capabilities tool record citing the given chunks."""
+    return {
+        "tool_name": "search_capabilities",
+        "tool_input": {"query": "q"},
+        "tool_result": {
+            "capabilities": [
+                {
+                    "relevance_score": 0.5,
+                    "citations": [
+                        {
+                            "chunk_id": chunk_id,
+                            "source_document_id": f"doc-{chunk_id}",
+                            "source_title": f"Title {chunk_id}",
+                            "quote": f"Quote {chunk_id}",
+                        }
+                        for chunk_id in chunk_ids
+                    ],
+                }
+            ]
+        },
+    }
+
+
+class FakeLLM:
+    """Answers each turn with the next scripted reply and tool results."""
+
+    def __init__(self, turns: list[tuple[str, list[dict]]]):
+        self.turns = list(turns)
+
+    async def generate_with_tools(self, messages, tools, system, tool_executor):
+        content, tool_results = self.turns.pop(0)
+        return {"content": content, "tool_calls": [], "all_tool_results": tool_results}
+
+
+@pytest_asyncio.fixture
+async def database():
+    """Create the tables, and close pooled connections after the test."""
+    await init_db()
+    yield
+    await engine.dispose()
+
+
+async def send(message: str, conversation_id=None):
+    """Send one message in its own session, as a request would."""
+    async with async_session_maker() as session:
+        return await ChatService(session).chat(message, conversation_id)
+
+
+async def load(conversation_id: str) -> Conversation:
+    """Reload a conversation from the database."""
+    async with async_session_maker() as session:
+        return await session.get(Conversation, conversation_id)
+
+
+@pytest.mark.asyncio
+async def test_turns_append_messages_and_dedupe_sources(database, monkeypatch):
+    llm = FakeLLM([
+        ("First reply", [search_result("c1", "c2"), search_result("c1")]),
+        ("Second reply", [search_result("c2", "c3")]),
+    ])
+    monkeypatch.setattr(chat_module, "get_llm_service", lambda: llm)
+
+    first = await send("First question")
+    assert [s.chunk_id for s in first.sources] == ["c1", "c2"]
+    second = await send("Second question", first.conversation_id)
+    assert second.conversation_id == first.conversation_id
+
+    conversation = await load(first.conversation_id)
+    assert conversation.messages == [
+        {"role": "user", "content": "First question"},
+        {"role": "assistant", "content": "First reply"},
+        {"role": "user", "content": "Second question"},
+        {"role": "assistant", "content": "Second reply"},
+    ]
+    assert conversation.message_count == 4
+    assert [s["chunk_id"] for s in conversation.sources] == ["c1", "c2", "c3"]
+    assert conversation.source_chunk_ids == ["c1", "c2", "c3"]
+    assert conversation.sources[2]["source_title"] == "Title c3"
+    assert conversation.preview == "First question"
+    assert conversation.title == "First question"
+
+
+@pytest.mark.asyncio
+async def test_turn_fills_columns_missing_on_older_rows(database, monkeypatch):
+    llm = FakeLLM([
+        ("First reply", [search_result("c1")]),
+        ("Second reply", [search_result("c1", "c2")]),
+    ])
+    monkeypatch.setattr(chat_module, "get_llm_service", lambda: llm)
+
+    first = await send("x" * 150)
+    # As stored before preview, message_count and source_chunk_ids existed
+    async with async_session_maker() as session:
+        await session.execute(
+            update(Conversation)
+            .where(Conversation.id == first.conversation_id)
+            .values(preview=None, message_count=None, source_chunk_ids=None)
+        )
+        await session.commit()
+
+    await send("Second question", first.conversation_id)
+
+    conversation = await load(first.conversation_id)
+    assert len(conversation.messages) == conversation.message_count == 4
+    assert [s["chunk_id"] for s in conversation.sources] == ["c1", "c2"]
+    assert conversation.source_chunk_ids == ["c1", "c2"]
+    assert conversation.preview == "x" * 100 + "..."
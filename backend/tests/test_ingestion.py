@@ -0,0 +1,86 @@
+"""Tests for text chunking in the ingestion service."""
+
+import random
+
+import pytest
+
+from app.services.ingestion import CHUNK_SENTENCE_SNAP_WORDS, IngestionService
+
+
+@pytest.fixture
+def service() -> IngestionService:
+    """Ingestion service with no database; chunking does not touch it."""
+    return IngestionService(db=None)
+
+
+def make_words(count: int, sentence_ends: tuple[int, ...] = ()) -> list[str]:
+    """Build unique words w0, w1, ..., ending a sentence at the given indexes."""
+    return [f"w{i}." if i in sentence_ends else f"w{i}" for i in range(count)]
+
+
+def word_indexes(chunk: dict) -> list[int]:
+    """Recover the word indexes in a chunk built from make_words()."""
+    return [int(word.strip("w.")) for word in chunk["text"].split()]
+
+
+def test_fixed_stride_and_overlap(service):
+    chunks = service._chunk_words(make_words(1200), chunk_size=500, chunk_overlap=50)
+    spans = [word_indexes(chunk) for chunk in chunks]
+    assert [(span[0], span[-1]) for span in spans] == [(0, 499), (450, 949), (900, 1199)]
+    for previous, current in zip(spans, spans[1:]):
+        assert previous[-50:] == current[:50]
+    assert [chunk["metadata"]["word_count"] for chunk in chunks] == [500, 500, 300]
+
+
+def test_snaps_to_sentence_end_near_window_end(service):
+    words = make_words(1000, sentence_ends=(489,))
+    chunks = service._chunk_words(words, chunk_size=500, chunk_overlap=50)
+    first, second = word_indexes(chunks[0]), word_indexes(chunks[1])
+    assert first[-1] == 489
+    # The next window starts chunk_overlap words before the snapped end
+    assert second[0] == 440
+
+
+def test_sentence_end_outside_snap_window_is_ignored(service):
+    words = make_words(1000, sentence_ends=(499 - CHUNK_SENTENCE_SNAP_WORDS,))
+    chunks = service._chunk_words(words, chunk_size=500, chunk_overlap=50)
+    assert word_indexes(chunks[0])[-1] == 499
+
+
+def test_document_shorter_than_one_chunk(service):
+    chunks = service._chunk_text("Only a few words. Here.", chunk_size=500, chunk_overlap=50)
+    assert chunks == [{"text": "Only a few words. Here.", "metadata": {"word_count": 5}}]
+
+
+def test_empty_document_has_no_chunks(service):
+    assert service._chunk_text("   \n") == []
+
+
+def test_final_partial_chunk_is_not_snapped(service):
+    words = make_words(700, sentence_ends=(690,))
+    chunks = service._chunk_words(words, chunk_size=500, chunk_overlap=50)
+    last = word_indexes(chunks[-1])
+    assert (last[0], last[-1]) == (450, 699)
+    assert chunks[-1]["metadata"]["word_count"] == 250
+
+
+@pytest.mark.parametrize("chunk_size,chunk_overlap", [(500, 50), (40, 10), (10, 9), (5, 0)])
+def test_snapping_keeps_chunks_nonempty_bounded_and_contiguous(
+    service, chunk_size, chunk_overlap
+):
+    rng = random.Random(chunk_size * 100 + chunk_overlap)
+    for _ in range(20):
+        count = rng.randrange(1, 3 * chunk_size)
+        sentence_ends = tuple(i for i in range(count) if rng.random() < 0.2)
+        chunks = service._chunk_words(make_words(count, sentence_ends), chunk_size, chunk_overlap)
+
+        spans = [word_indexes(chunk) for chunk in chunks]
+        assert spans[0][0] == 0
+        assert spans[-1][-1] == count - 1
+        for span, chunk in zip(spans, chunks):
+            assert 1 <= len(span) <= chunk_size
+            assert span == list(range(span[0], span[-1] + 1))
+            assert chunk["metadata"]["word_count"] == len(span)
+        for previous, current in zip(spans, spans[1:]):
+            # Each window moves forward without leaving a gap
+            assert previous[0] < current[0] <= previous[-1] + 1
@@ -0,0 +1,137 @@
+"""Tests for streamed plan parsing in the planner service."""
+
+import numpy as np
+import orjson
+import pytest
+
+from app.services import planner as planner_module
+from app.services.cache import plan_cache
+from app.services.planner import PlannerService, _PlanJSONScanner
+
+PLAN = {
+    "goal_summary": 'Goal with {braces} and "quotes"',
+    "assumptions": ["brackets ] in [ strings"],
+    "steps": [
+        {
+            "step_id": "S1",
+            "objective": "Close } then open {",
+            "citations": [{"source_document_id": "d1", "quote": 'ends with \\ and "'}],
+        },
+        {"step_id": "S2", "objective": "Second", "inputs": ["[nested]", "{x}"]},
+    ],
+    "open_questions": [],
+    "risks_and_alternatives": [{"risk": "r", "impact": "i"}],
+}
+PLAN_TEXT = orjson.dumps(PLAN, option=orjson.OPT_INDENT_2).decode()
+
+
+def scan(chunks: list[str]) -> tuple[list[dict], _PlanJSONScanner]:
+    """Feed chunks to a new scanner, returning the parsed steps and scanner."""
+    scanner = _PlanJSONScanner()
+    steps = []
+    for chunk in chunks:
+        steps.extend(orjson.loads(step) for step in scanner.feed(chunk))
+    return steps, scanner
+
+
+def test_braces_and_escaped_quotes_in_strings():
+    steps, scanner = scan([PLAN_TEXT])
+    assert steps == PLAN["steps"]
+    assert orjson.loads(scanner.plan_json) == PLAN
+
+
+def test_text_around_json_is_skipped():
+    text = f"Here is the plan:\n```json\n{PLAN_TEXT}\n```\nLet me know {{any}} changes."
+    steps, scanner = scan([text])
+    assert [step["step_id"] for step in steps] == ["S1", "S2"]
+    assert scanner.plan_json == PLAN_TEXT
+
+
+def test_step_split_at_every_offset():
+    for offset in range(1, len(PLAN_TEXT)):
+        steps, scanner = scan([PLAN_TEXT[:offset], PLAN_TEXT[offset:]])
+        assert steps == PLAN["steps"], offset
+        assert scanner.plan_json == PLAN_TEXT, offset
+
+
+def test_one_character_chunks():
+    steps, scanner = scan(list(PLAN_TEXT))
+    assert steps == PLAN["steps"]
+    assert scanner.plan_json == PLAN_TEXT
+
+
+def test_truncated_plan_has_no_json():
+    steps, scanner = scan([PLAN_TEXT[:-1]])
+    assert len(steps) == 2
+    assert scanner.plan_json is None
+
+
+class FakeLLM:
+    """Streams a fixed response in small chunks."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    async def astream(self, messages, system=None, max_tokens=4096):
+        for i in range(0, len(self.text), 7):
+            yield self.text[i:i + 7]
+
+
+class FakeEmbeddings:
+    """Embeds every text as the same vector."""
+
+    async def generate_embedding(self, text):
+        return np.ones(4, dtype=np.float32)
+
+
+class FakeRetrieval:
+    """Finds no capabilities."""
+
+    embedding_service = FakeEmbeddings()
+
+    async def search_capabilities(self, query, top_k=10, **filters):
+        return []
+
+
+@pytest.fixture(autouse=True)
+def clear_plan_cache():
+    """Keep plans cached by one test from being served to another."""
+    yield
+    plan_cache.invalidate()
+    planner_module._plan_goal_embeddings.clear()
+
+
+def make_planner(monkeypatch, response: str) -> PlannerService:
+    """Build a planner whose LLM streams response."""
+    monkeypatch.setattr(planner_module, "get_llm_service", lambda: FakeLLM(response))
+    monkeypatch.setattr(planner_module, "get_retrieval_service", lambda db: FakeRetrieval())
+    return PlannerService(db=None)
+
+
+@pytest.mark.asyncio
+async def test_stream_plan_yields_steps_then_plan(monkeypatch):
+    planner = make_planner(monkeypatch, f"Plan:\n{PLAN_TEXT}")
+    items = [item async for item in planner.stream_plan("stream steps goal")]
+    assert [step.step_id for step in items[:-1]] == ["S1", "S2"]
+    plan = items[-1]
+    assert plan.steps == items[:-1]
+    assert plan.steps[0].citations[0].quote == 'ends with \\ and "'
+    assert plan.risks_and_alternatives[0].risk == "r"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "response",
+    [
+        PLAN_TEXT[:len(PLAN_TEXT) // 2],
+        "No JSON in this response",
+        '{"goal_summary": "unquoted value", "steps": [oops]}',
+        '{"goal_summary": "wrong type", "steps": 5}',
+    ],
+    ids=["truncated", "no-json", "malformed", "invalid"],
+)
+async def test_unparseable_plan_falls_back(monkeypatch, response):
+    planner = make_planner(monkeypatch, response)
+    plan = await planner.generate_plan(f"fallback goal {len(response)}")
+    assert plan.goal_summary == "Failed to parse plan"
+    assert plan.steps == []
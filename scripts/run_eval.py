@@ -10,178 +10,219 @@ This script runs test cases against the planner and evaluates:
 
 import argparse
 import asyncio
-import json
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
 
 from app.config import get_settings
 from app.models.database import async_session_maker, init_db
-from app.services.planner import get_planner_service
+from app.services.planner import PlannerService, get_planner_service
+
+# Test cases run at once by default; each mostly waits on the LLM
+DEFAULT_CONCURRENCY = 4
+
+
+def positive_int(value: str) -> int:
+    """Parse a command-line integer that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
-async def run_test_case(test_case: dict) -> dict:
+async def run_test_case(test_case: dict, planner: PlannerService) -> dict:
     """Run a single test case and return results."""
     print(f"  Running: {test_case['name']}...")
 
-    async with async_session_maker() as session:
-        planner = get_planner_service(session)
-
-        try:
-            plan = await planner.generate_plan(
-                goal=test_case["description"],
-                context=None,
-                constraints=None,
-            )
-
-            # Analyze results
-            total_steps = len(plan.steps)
-            steps_with_citations = sum(
-                1 for step in plan.steps if len(step.citations) > 0
-            )
-            citation_rate = steps_with_citations / total_steps if total_steps > 0 else 0
-
-            # Count unique facilities/labs
-            unique_facilities = set()
-            for step in plan.steps:
-                if step.recommended_facility:
-                    unique_facilities.add(step.recommended_facility.lower())
-
-            # Count hypotheses
-            hypothesis_steps = sum(1 for step in plan.steps if step.is_hypothesis)
-
-            result = {
-                "test_case_id": test_case["id"],
-                "test_case_name": test_case["name"],
-                "success": True,
-                "plan_generated": True,
-                "metrics": {
-                    "total_steps": total_steps,
-                    "steps_with_citations": steps_with_citations,
-                    "citation_rate": citation_rate,
-                    "unique_facilities": len(unique_facilities),
-                    "hypothesis_steps": hypothesis_steps,
-                    "meets_min_labs": len(unique_facilities) >= test_case.get("expected_min_labs", 1),
-                    "meets_min_steps": total_steps >= test_case.get("expected_min_steps", 1),
-                },
-                "plan": {
-                    "goal_summary": plan.goal_summary,
-                    "assumptions": plan.assumptions,
-                    "steps": [
-                        {
-                            "step_id": s.step_id,
-                            "objective": s.objective,
-                            "facility": s.recommended_facility,
-                            "has_citations": len(s.citations) > 0,
-                            "is_hypothesis": s.is_hypothesis,
-                        }
-                        for s in plan.steps
-                    ],
-                    "open_questions": plan.open_questions,
-                    "risks_count": len(plan.risks_and_alternatives),
-                },
-                "error": None,
-            }
-
-        except Exception as e:
-            result = {
-                "test_case_id": test_case["id"],
-                "test_case_name": test_case["name"],
-                "success": False,
-                "plan_generated": False,
-                "metrics": None,
-                "plan": None,
-                "error": str(e),
-            }
+    try:
+        plan = await planner.generate_plan(
+            goal=test_case["description"],
+            context=None,
+            constraints=None,
+        )
+
+        # Analyze results in one pass over the steps
+        total_steps = len(plan.steps)
+        steps_with_citations = 0
+        hypothesis_steps = 0
+        unique_facilities = set()
+        step_summaries = []
+        for step in plan.steps:
+            has_citations = len(step.citations) > 0
+            steps_with_citations += has_citations
+            hypothesis_steps += step.is_hypothesis
+            if step.recommended_facility:
+                unique_facilities.add(step.recommended_facility.lower())
+            step_summaries.append({
+                "step_id": step.step_id,
+                "objective": step.objective,
+                "facility": step.recommended_facility,
+                "has_citations": has_citations,
+                "is_hypothesis": step.is_hypothesis,
+            })
+        citation_rate = steps_with_citations / total_steps if total_steps > 0 else 0
+
+        result = {
+            "test_case_id": test_case["id"],
+            "test_case_name": test_case["name"],
+            "success": True,
+            "plan_generated": True,
+            "metrics": {
+                "total_steps": total_steps,
+                "steps_with_citations": steps_with_citations,
+                "citation_rate": citation_rate,
+                "unique_facilities": len(unique_facilities),
+                "hypothesis_steps": hypothesis_steps,
+                "meets_min_labs": len(unique_facilities) >= test_case.get("expected_min_labs", 1),
+                "meets_min_steps": total_steps >= test_case.get("expected_min_steps", 1),
+            },
+            "plan": {
+                "goal_summary": plan.goal_summary,
+                "assumptions": plan.assumptions,
+                "steps": step_summaries,
+                "open_questions": plan.open_questions,
+                "risks_count": len(plan.risks_and_alternatives),
+            },
+            "error": None,
+        }
+
+    except Exception as e:
+        result = {
+            "test_case_id": test_case["id"],
+            "test_case_name": test_case["name"],
+            "success": False,
+            "plan_generated": False,
+            "metrics": None,
+            "plan": None,
+            "error": str(e),
+        }
 
     return result
 
 
-async def run_evaluation(test_cases_path: Path, output_dir: Path) -> dict:
-    """Run all test cases and generate reports."""
+async def run_evaluation(
+    test_cases_path: Path,
+    output_dir: Path,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    write_json: bool = True,
+    pretty_json: bool = False,
+    write_markdown: bool = True,
+    init_database: bool = True,
+    summary_only: bool = False,
+) -> dict:
+    """Run all test cases and generate reports.
+
+    Test cases run concurrently, at most ``concurrency`` at a time; results
+    keep the order of the test cases file.
+
+    Args:
+        test_cases_path: Test cases JSON file
+        output_dir: Directory for the reports
+        concurrency: Maximum number of test cases run at once; values
+            below 1 are treated as 1
+        write_json: Whether to write eval_report.json
+        pretty_json: Whether to indent eval_report.json (compact otherwise)
+        write_markdown: Whether to write eval_report.md
+        init_database: Whether to create missing tables first; skip it
+            when the database is known to be set up
+        summary_only: Whether to keep only the counts and aggregate
+            metrics, leaving out the per-case results and the markdown
+            report (per-case results are still in the NDJSON file)
+
+    Returns:
+        The report dict
+    """
     # Load test cases
-    with open(test_cases_path) as f:
-        data = json.load(f)
-        test_cases = data["test_cases"]
+    test_cases = orjson.loads(test_cases_path.read_bytes())["test_cases"]
 
     print(f"Running {len(test_cases)} test cases...")
 
     # Initialize database
-    await init_db()
+    if init_database:
+        await init_db()
 
-    # Run test cases
-    results = []
-    for test_case in test_cases:
-        result = await run_test_case(test_case)
-        results.append(result)
-
-    # Calculate aggregate metrics
+    # Run test cases on up to `concurrency` workers, each with its own
+    # session and planner reused for the cases it picks up. Each result is
+    # also appended to an NDJSON file as soon as it is ready, so finished
+    # cases are kept even if the run is interrupted.
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ndjson_path = output_dir / "eval_results.ndjson"
+    results: list[dict] = [None] * len(test_cases)
+    pending = iter(enumerate(test_cases))
+
+    with open(ndjson_path, "wb") as ndjson_file:
+
+        async def worker() -> None:
+            async with async_session_maker() as session:
+                planner = get_planner_service(session)
+                for index, test_case in pending:
+                    result = results[index] = await run_test_case(test_case, planner)
+                    if not result["success"]:
+                        await session.rollback()
+                    ndjson_file.write(orjson.dumps(result) + b"\n")
+                    ndjson_file.flush()
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(max(1, concurrency), len(test_cases))))
+        )
+    print(f"Results streamed to: {ndjson_path}")
+
+    # Calculate aggregate metrics in one pass over the successful cases
     successful = [r for r in results if r["success"]]
-    total_citation_rate = (
-        sum(r["metrics"]["citation_rate"] for r in successful) / len(successful)
-        if successful
-        else 0
-    )
-    avg_steps = (
-        sum(r["metrics"]["total_steps"] for r in successful) / len(successful)
-        if successful
-        else 0
-    )
-    avg_facilities = (
-        sum(r["metrics"]["unique_facilities"] for r in successful) / len(successful)
-        if successful
-        else 0
-    )
-    meets_lab_threshold = (
-        sum(1 for r in successful if r["metrics"]["meets_min_labs"]) / len(successful)
-        if successful
-        else 0
-    )
-    meets_step_threshold = (
-        sum(1 for r in successful if r["metrics"]["meets_min_steps"]) / len(successful)
-        if successful
-        else 0
-    )
+    total_citation_rate = total_steps = total_facilities = 0
+    meets_labs = meets_steps = 0
+    for r in successful:
+        metrics = r["metrics"]
+        total_citation_rate += metrics["citation_rate"]
+        total_steps += metrics["total_steps"]
+        total_facilities += metrics["unique_facilities"]
+        meets_labs += metrics["meets_min_labs"]
+        meets_steps += metrics["meets_min_steps"]
+    num_successful = len(successful) or 1
 
     report = {
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "total_test_cases": len(test_cases),
         "successful": len(successful),
         "failed": len(results) - len(successful),
         "aggregate_metrics": {
-            "avg_citation_rate": total_citation_rate,
-            "avg_steps_per_plan": avg_steps,
-            "avg_unique_facilities": avg_facilities,
-            "pct_meets_min_labs": meets_lab_threshold,
-            "pct_meets_min_steps": meets_step_threshold,
+            "avg_citation_rate": total_citation_rate / num_successful,
+            "avg_steps_per_plan": total_steps / num_successful,
+            "avg_unique_facilities": total_facilities / num_successful,
+            "pct_meets_min_labs": meets_labs / num_successful,
+            "pct_meets_min_steps": meets_steps / num_successful,
         },
-        "results": results,
     }
+    if not summary_only:
+        report["results"] = results
 
     # Write JSON report
-    output_dir.mkdir(parents=True, exist_ok=True)
-    json_path = output_dir / "eval_report.json"
-    with open(json_path, "w") as f:
-        json.dump(report, f, indent=2)
-    print(f"JSON report written to: {json_path}")
+    if write_json:
+        json_path = output_dir / "eval_report.json"
+        json_option = orjson.OPT_INDENT_2 if pretty_json else None
+        json_path.write_bytes(orjson.dumps(report, option=json_option))
+        print(f"JSON report written to: {json_path}")
 
     # Write Markdown report
-    md_report = generate_markdown_report(report)
-    md_path = output_dir / "eval_report.md"
-    with open(md_path, "w") as f:
-        f.write(md_report)
-    print(f"Markdown report written to: {md_path}")
+    if write_markdown and not summary_only:
+        md_report = generate_markdown_report(report)
+        md_path = output_dir / "eval_report.md"
+        with open(md_path, "w") as f:
+            f.write(md_report)
+        print(f"Markdown report written to: {md_path}")
 
     return report
 
 
 def generate_markdown_report(report: dict) -> str:
     """Generate a human-readable markdown report."""
-    md = f"""# OPAL Orchestrator Evaluation Report
+    parts = [f"""# OPAL Orchestrator Evaluation Report
 
 **Generated:** {report['timestamp']}
 
@@ -205,30 +246,30 @@ def generate_markdown_report(report: dict) -> str:
 
 ## Individual Test Results
 
-"""
+"""]
 
     for result in report["results"]:
         status = "PASS" if result["success"] else "FAIL"
-        md += f"### {result['test_case_name']} [{status}]\n\n"
+        parts.append(f"### {result['test_case_name']} [{status}]\n\n")
 
         if result["success"]:
             metrics = result["metrics"]
-            md += f"- **Steps:** {metrics['total_steps']}\n"
-            md += f"- **Citation Rate:** {metrics['citation_rate']:.1%}\n"
-            md += f"- **Unique Facilities:** {metrics['unique_facilities']}\n"
-            md += f"- **Hypothesis Steps:** {metrics['hypothesis_steps']}\n"
+            parts.append(f"- **Steps:** {metrics['total_steps']}\n")
+            parts.append(f"- **Citation Rate:** {metrics['citation_rate']:.1%}\n")
+            parts.append(f"- **Unique Facilities:** {metrics['unique_facilities']}\n")
+            parts.append(f"- **Hypothesis Steps:** {metrics['hypothesis_steps']}\n")
 
             if result["plan"]:
-                md += f"\n**Goal Summary:** {result['plan']['goal_summary']}\n\n"
-                md += "**Steps:**\n"
+                parts.append(f"\n**Goal Summary:** {result['plan']['goal_summary']}\n\n")
+                parts.append("**Steps:**\n")
                 for step in result["plan"]["steps"]:
                     citation_mark = "[cited]" if step["has_citations"] else "[hypothesis]"
-                    md += f"1. {step['objective']} @ {step['facility']} {citation_mark}\n"
-                md += "\n"
+                    parts.append(f"1. {step['objective']} @ {step['facility']} {citation_mark}\n")
+                parts.append("\n")
         else:
-            md += f"**Error:** {result['error']}\n\n"
+            parts.append(f"**Error:** {result['error']}\n\n")
 
-    return md
+    return "".join(parts)
 
 
 def main():
@@ -248,6 +289,44 @@ def main():
         default=Path(__file__).parent / "eval_output",
         help="Output directory for reports",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=positive_int,
+        default=DEFAULT_CONCURRENCY,
+        help=(
+            "Maximum number of test cases run at once; each uses up to two "
+            "database connections, so keep it within half of "
+            "DB_POOL_SIZE + DB_MAX_OVERFLOW"
+        ),
+    )
+    parser.add_argument(
+        "--no-json",
+        action="store_true",
+        help="Do not write eval_report.json",
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent eval_report.json for reading (written compact by default)",
+    )
+    parser.add_argument(
+        "--no-markdown",
+        action="store_true",
+        help="Do not write eval_report.md",
+    )
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help=(
+            "Only report pass/fail counts and aggregate metrics: no per-case "
+            "results in eval_report.json and no eval_report.md"
+        ),
+    )
+    parser.add_argument(
+        "--skip-db-init",
+        action="store_true",
+        help="Do not check for and create missing database tables",
+    )
 
     args = parser.parse_args()
 
@@ -255,7 +334,18 @@ def main():
         print(f"Error: Test cases file not found: {args.test_cases}")
         return 1
 
-    report = asyncio.run(run_evaluation(args.test_cases, args.output_dir))
+    report = asyncio.run(
+        run_evaluation(
+            args.test_cases,
+            args.output_dir,
+            args.concurrency,
+            write_json=not args.no_json,
+            pretty_json=args.pretty,
+            write_markdown=not args.no_markdown,
+            init_database=not args.skip_db_init,
+            summary_only=args.summary_only,
+        )
+    )
 
     # Print summary
     print("\n" + "=" * 60)